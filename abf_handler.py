@@ -17,6 +17,12 @@ class SweepData:
     data: np.ndarray
     command: np.ndarray
     sample_rate: float
+    has_command: Optional[bool] = None  # Any nonzero command sample (None if not known)
+    
+    def __post_init__(self):
+        # A missing command waveform is stored as an empty array, so callers only check its size
+        if self.command is None:
+            self.command = np.empty(0, dtype=np.float32)
 
 
 @dataclass
@@ -38,6 +44,10 @@ class ABFHandler:
         self.abf: Optional[pyabf.ABF] = None
         self._current_sweep = 0
         self._current_channel = 0
+        self._cached_protocol: Optional[ProtocolInfo] = None
+        self._cached_file_info: Optional[Dict] = None
+        self._command_flags: Dict[Tuple[int, int], bool] = {}
+        self._sweep_matrices: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
         
         if file_path:
             self.load_file(file_path)
@@ -45,14 +55,25 @@ class ABFHandler:
     def load_file(self, file_path: str) -> bool:
         """Load an ABF file"""
         try:
-            self.abf = pyabf.ABF(file_path)
-            self.file_path = file_path
-            self._current_sweep = 0
-            self._current_channel = 0
-            return True
+            abf = pyabf.ABF(file_path)
         except Exception as e:
             print(f"Error loading ABF file: {e}")
             return False
+        
+        self.adopt_preparsed(abf, file_path)
+        return True
+    
+    def adopt_preparsed(self, abf: pyabf.ABF, file_path: str):
+        """Use an ABF object that was already parsed (e.g. on a background thread)"""
+        self.abf = abf
+        self.file_path = file_path
+        self._current_sweep = 0
+        self._current_channel = 0
+        # File metadata is immutable; rebuild it lazily for the new file
+        self._cached_protocol = None
+        self._cached_file_info = None
+        self._command_flags = {}
+        self._sweep_matrices = {}
     
     @property
     def is_loaded(self) -> bool:
@@ -94,31 +115,32 @@ class ABFHandler:
             return ""
         return getattr(self.abf, 'protocol', 'Unknown')
     
+    def _channel_units(self) -> Tuple[List[str], List[str]]:
+        """Get ADC and DAC units per channel ("" where a channel has none)"""
+        adc = list(getattr(self.abf, 'adcUnits', None) or [])
+        dac = list(getattr(self.abf, 'dacUnits', None) or [])
+        channels = range(self.channel_count)
+        adc_units = [adc[i] if i < len(adc) else "" for i in channels]
+        dac_units = [dac[i] if i < len(dac) else "" for i in channels]
+        return adc_units, dac_units
+    
     def get_protocol_info(self) -> ProtocolInfo:
         """Get protocol information"""
         if not self.is_loaded:
             return ProtocolInfo("", [], [], 0, 0, 0)
         
-        adc_units = []
-        dac_units = []
-        for i in range(self.channel_count):
-            try:
-                adc_units.append(self.abf.adcUnits[i])
-            except:
-                adc_units.append("")
-            try:
-                dac_units.append(self.abf.dacUnits[i] if i < len(self.abf.dacUnits) else "")
-            except:
-                dac_units.append("")
-        
-        return ProtocolInfo(
-            name=self.protocol_name,
-            adc_units=adc_units,
-            dac_units=dac_units,
-            sample_rate=self.sample_rate,
-            sweep_count=self.sweep_count,
-            sweep_length_sec=self.sweep_length_sec
-        )
+        if self._cached_protocol is None:
+            adc_units, dac_units = self._channel_units()
+            
+            self._cached_protocol = ProtocolInfo(
+                name=self.protocol_name,
+                adc_units=adc_units,
+                dac_units=dac_units,
+                sample_rate=self.sample_rate,
+                sweep_count=self.sweep_count,
+                sweep_length_sec=self.sweep_length_sec
+            )
+        return self._cached_protocol
     
     def get_sweep(self, sweep_number: int, channel: int = 0) -> Optional[SweepData]:
         """Get sweep data for specified sweep and channel"""
@@ -133,14 +155,29 @@ class ABFHandler:
         
         try:
             self.abf.setSweep(sweepNumber=sweep_number, channel=channel)
+            command = self.abf.sweepC if hasattr(self.abf, 'sweepC') else np.zeros_like(self.abf.sweepX)
+            
+            # Whether the command waveform is nonzero is checked once per sweep and channel
+            key = (sweep_number, channel)
+            has_command = self._command_flags.get(key)
+            if has_command is None:
+                has_command = self._command_flags[key] = bool(np.count_nonzero(command))
+            
+            # Callers share sweeps rather than copying them, so they are read-only;
+            # anything that modifies a trace must copy it first
+            time = self.abf.sweepX
+            data = np.asarray(self.abf.sweepY, dtype=np.float32)
+            time.setflags(write=False)
+            data.setflags(write=False)
             
             return SweepData(
                 sweep_number=sweep_number,
                 channel=channel,
-                time=self.abf.sweepX,
-                data=self.abf.sweepY,
-                command=self.abf.sweepC if hasattr(self.abf, 'sweepC') else np.zeros_like(self.abf.sweepX),
-                sample_rate=self.sample_rate
+                time=time,
+                data=data,
+                command=command,
+                sample_rate=self.sample_rate,
+                has_command=has_command
             )
         except Exception as e:
             print(f"Error getting sweep: {e}")
@@ -151,12 +188,66 @@ class ABFHandler:
         if not self.is_loaded:
             return []
         
-        sweeps = []
-        for i in range(self.sweep_count):
-            sweep = self.get_sweep(i, channel)
-            if sweep:
-                sweeps.append(sweep)
-        return sweeps
+        matrix = self.get_sweep_matrix(channel)
+        if matrix is None:
+            return []
+        
+        # Each SweepData holds row views into the shared sweep matrices
+        time, data, command = matrix
+        has_command = np.count_nonzero(command, axis=1) > 0
+        return [
+            SweepData(
+                sweep_number=i,
+                channel=channel,
+                time=time,
+                data=data[i],
+                command=command[i],
+                sample_rate=self.sample_rate,
+                has_command=bool(has_command[i])
+            )
+            for i in range(data.shape[0])
+        ]
+    
+    def get_sweep_matrix(self, channel: int = 0) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get all sweeps for a channel as (sweeps x samples) arrays
+        
+        Returns:
+            Tuple of (time, data, command): time is shared by all sweeps,
+            data and command have one row per sweep. The arrays are cached
+            per channel until another file is loaded, so they are read-only.
+        """
+        if not self.is_loaded:
+            return None
+        
+        if channel < 0 or channel >= self.channel_count:
+            return None
+        
+        cached = self._sweep_matrices.get(channel)
+        if cached is not None:
+            return cached
+        
+        try:
+            self.abf.setSweep(sweepNumber=0, channel=channel)
+            time = np.array(self.abf.sweepX, dtype=np.float64)
+            # pyABF stores ADC data as float32; keep it that way
+            data = np.empty((self.sweep_count, len(time)), dtype=np.float32)
+            command = np.zeros((self.sweep_count, len(time)), dtype=np.float64)
+            has_command = hasattr(self.abf, 'sweepC')
+            
+            for i in range(self.sweep_count):
+                self.abf.setSweep(sweepNumber=i, channel=channel)
+                data[i] = self.abf.sweepY
+                if has_command:
+                    command[i] = self.abf.sweepC
+            
+            for array in (time, data, command):
+                array.setflags(write=False)
+            self._sweep_matrices[channel] = (time, data, command)
+            return time, data, command
+        except Exception as e:
+            print(f"Error getting sweep matrix: {e}")
+            return None
     
     def set_current_sweep(self, sweep_number: int):
         """Set current sweep"""
@@ -181,6 +272,9 @@ class ABFHandler:
         if not self.is_loaded:
             return {}
         
+        if self._cached_file_info is not None:
+            return self._cached_file_info
+        
         info = {
             'filename': self.abf.abfFilePath,
             'protocol': getattr(self.abf, 'protocol', 'Unknown'),
@@ -192,14 +286,12 @@ class ABFHandler:
         }
         
         # Add channel-specific info
-        info['channel_info'] = []
-        for i in range(self.channel_count):
-            channel_info = {
-                'index': i,
-                'adc_units': self.abf.adcUnits[i] if i < len(self.abf.adcUnits) else "",
-                'dac_units': self.abf.dacUnits[i] if i < len(self.abf.dacUnits) else "",
-            }
-            info['channel_info'].append(channel_info)
+        adc_units, dac_units = self._channel_units()
+        info['channel_info'] = [
+            {'index': i, 'adc_units': adc, 'dac_units': dac}
+            for i, (adc, dac) in enumerate(zip(adc_units, dac_units))
+        ]
         
+        self._cached_file_info = info
         return info
 
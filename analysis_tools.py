@@ -2,12 +2,102 @@
 Analysis Tools
 Provides various analysis functions for electrophysiology data
 """
+import os
+import threading
 import numpy as np
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass
 from scipy import signal
 from scipy.optimize import curve_fit
-from scipy.ndimage import gaussian_filter1d
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# np.trapz was renamed to np.trapezoid in NumPy 2.0
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+def _kernel_array(data: np.ndarray) -> np.ndarray:
+    """Contiguous float32 or float64 array for the numba kernels (float32 is kept as is)"""
+    data = np.asarray(data)
+    if data.dtype != np.float32:
+        data = data.astype(np.float64, copy=False)
+    return np.ascontiguousarray(data)
+
+
+# Kernels longer than this are applied with overlap-add FFT convolution; below it
+# direct convolution is faster (crossover measured around 200 taps)
+_FFT_CONVOLVE_MIN_TAPS = 256
+
+# Per-thread scratch buffers reused across repeated filter calls
+_workspace = threading.local()
+
+
+def _padded_workspace(data: np.ndarray, radius: int) -> np.ndarray:
+    """
+    Copy data into a reused buffer with `radius` samples of symmetric padding
+    on each side (same layout as np.pad(..., mode='symmetric'))
+    """
+    data = _kernel_array(data)
+    n = len(data)
+    if radius > n:
+        # Padding wider than the trace needs repeated reflection
+        return np.pad(data, radius, mode='symmetric')
+    
+    needed = n + 2 * radius
+    buffers = getattr(_workspace, 'padded', None)
+    if buffers is None:
+        buffers = _workspace.padded = {}
+    buffer = buffers.get(data.dtype)
+    if buffer is None or buffer.shape[0] < needed:
+        buffer = np.empty(needed, dtype=data.dtype)
+        buffers[data.dtype] = buffer
+    padded = buffer[:needed]
+    padded[radius:radius + n] = data
+    if radius:
+        padded[:radius] = data[radius - 1::-1] if radius < n else data[::-1]
+        padded[radius + n:] = data[:n - radius - 1:-1] if radius < n else data[::-1]
+    return padded
+
+
+@lru_cache(maxsize=64)
+def _butter_sos(filter_type: str, cutoff, sample_rate: float, order: int) -> Optional[np.ndarray]:
+    """Design a Butterworth filter as second-order sections, cached by its parameters"""
+    nyquist = sample_rate / 2
+    
+    if filter_type == 'lowpass':
+        sos = signal.butter(order, cutoff / nyquist, 'low', output='sos')
+    elif filter_type == 'highpass':
+        sos = signal.butter(order, cutoff / nyquist, 'high', output='sos')
+    elif filter_type == 'bandpass':
+        low, high = cutoff
+        sos = signal.butter(order, [low / nyquist, high / nyquist], 'band', output='sos')
+    else:
+        return None
+    
+    return sos
+
+
+@lru_cache(maxsize=32)
+def _gaussian_kernel(sigma_samples: float, truncate: float = 4.0) -> np.ndarray:
+    """Normalized Gaussian kernel, same taps as scipy's gaussian_filter1d"""
+    radius = int(truncate * sigma_samples + 0.5)
+    x = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 / sigma_samples ** 2 * x ** 2)
+    kernel /= kernel.sum()
+    kernel.setflags(write=False)
+    return kernel
 
 
 @dataclass
@@ -31,6 +121,66 @@ class Measurement:
     slope: float
 
 
+@dataclass(frozen=True)
+class BlockDetectionParams:
+    """Parameters for BlockDetector, as entered in the block detection dialog"""
+    baseline_threshold: Optional[float]  # None to estimate the baseline
+    block_threshold_factor: float
+    min_block_duration: float
+
+
+@dataclass
+class BlockEvents:
+    """Block events stored as parallel arrays, one element per block"""
+    start_idx: np.ndarray
+    end_idx: np.ndarray
+    start_time: np.ndarray
+    end_time: np.ndarray
+    duration: np.ndarray
+    average_amplitude: np.ndarray
+    baseline_amplitude: np.ndarray
+    block_depth: np.ndarray
+    sweep_number: Optional[np.ndarray] = None
+    channel: Optional[np.ndarray] = None
+    
+    # Field order of the dictionaries returned by as_records()
+    RECORD_FIELDS = ('start_time', 'end_time', 'duration', 'start_idx', 'end_idx',
+                     'average_amplitude', 'baseline_amplitude', 'block_depth',
+                     'sweep_number', 'channel')
+    
+    def __len__(self) -> int:
+        return len(self.start_idx)
+    
+    @classmethod
+    def empty(cls) -> 'BlockEvents':
+        """Create an empty set of block events"""
+        no_indices = np.empty(0, dtype=np.int64)
+        no_values = np.empty(0, dtype=np.float64)
+        return cls(no_indices, no_indices, no_values, no_values, no_values,
+                   no_values, no_values, no_values)
+    
+    @classmethod
+    def concatenate(cls, events: List['BlockEvents']) -> 'BlockEvents':
+        """Join several sets of block events (e.g. one per sweep) end to end"""
+        if len(events) == 0:
+            return cls.empty()
+        
+        columns = {}
+        for name in cls.RECORD_FIELDS:
+            arrays = [getattr(e, name) for e in events]
+            if any(a is None for a in arrays):
+                columns[name] = None
+            else:
+                columns[name] = np.concatenate(arrays)
+        return cls(**columns)
+    
+    def as_records(self) -> List[Dict]:
+        """Convert to a list of per-block dictionaries"""
+        columns = {name: getattr(self, name).tolist() for name in self.RECORD_FIELDS
+                   if getattr(self, name) is not None}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
 class AnalysisTools:
     """Collection of analysis tools for electrophysiology data"""
     
@@ -96,31 +246,74 @@ class AnalysisTools:
     @staticmethod
     def calculate_statistics(data: np.ndarray) -> Dict:
         """Calculate basic statistics for data"""
+        # One sort gives min, max and all quantiles; mean and variance share
+        # the deviations computed from the same buffer. NumPy's vectorised sort
+        # beats np.partition on the handful of order statistics needed here
+        # (about 4x at 1e5-1e7 samples), despite O(n log n) against O(n)
+        sorted_data = np.sort(_kernel_array(data), axis=None)
+        n = sorted_data.size
+        if n == 0:
+            raise ValueError("Cannot calculate statistics of empty data")
+        
+        # Accumulate in float64 even for float32 sweeps
+        mean = sorted_data.mean(dtype=np.float64)
+        deviations = sorted_data - mean
+        variance = np.dot(deviations, deviations) / n
+        
+        if np.isnan(sorted_data[-1]):
+            # NaNs sort last; propagate them like the individual reductions would
+            nan = np.float64(np.nan)
+            min_value = max_value = median = q25 = q75 = nan
+        else:
+            min_value = sorted_data[0]
+            max_value = sorted_data[-1]
+            # Linear interpolation between order statistics (np.percentile default)
+            q25, median, q75 = (
+                AnalysisTools._sorted_quantile(sorted_data, q) for q in (0.25, 0.5, 0.75)
+            )
+        
         return {
-            'mean': np.mean(data),
-            'std': np.std(data),
-            'min': np.min(data),
-            'max': np.max(data),
-            'median': np.median(data),
-            'q25': np.percentile(data, 25),
-            'q75': np.percentile(data, 75),
-            'range': np.max(data) - np.min(data),
-            'variance': np.var(data)
+            'mean': mean,
+            'std': np.sqrt(variance),
+            'min': min_value,
+            'max': max_value,
+            'median': median,
+            'q25': q25,
+            'q75': q75,
+            'range': max_value - min_value,
+            'variance': variance
         }
     
+    @staticmethod
+    def _sorted_quantile(sorted_data: np.ndarray, q: float) -> float:
+        """Quantile of already-sorted data using linear interpolation"""
+        position = q * (sorted_data.size - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, sorted_data.size - 1)
+        fraction = position - lower
+        return sorted_data[lower] + (sorted_data[upper] - sorted_data[lower]) * fraction
+    
     @staticmethod
     def calculate_area_under_curve(data: np.ndarray, time: np.ndarray,
                                    start_idx: Optional[int] = None,
-                                   end_idx: Optional[int] = None) -> float:
-        """Calculate area under curve (integral)"""
+                                   end_idx: Optional[int] = None,
+                                   dt: Optional[float] = None) -> float:
+        """Calculate area under curve (integral). Pass dt (1 / sample rate) for uniformly sampled data"""
         if start_idx is None:
             start_idx = 0
         if end_idx is None:
             end_idx = len(data)
         
+        segment = data[start_idx:end_idx]
+        if len(segment) < 2:
+            return 0.0
+        
+        if dt is not None:
+            # Trapezoidal rule with a constant step, no pass over the time array
+            return dt * (np.sum(segment) - 0.5 * (segment[0] + segment[-1]))
+        
         # Use trapezoidal rule
-        area = np.trapz(data[start_idx:end_idx], time[start_idx:end_idx])
-        return area
+        return _trapezoid(segment, time[start_idx:end_idx])
     
     @staticmethod
     def detect_events(data: np.ndarray, time: np.ndarray,
@@ -145,16 +338,17 @@ class AnalysisTools:
         else:
             mask = data < threshold
         
-        # Find transitions
-        diff = np.diff(mask.astype(int))
-        starts = np.where(diff == 1)[0]
-        ends = np.where(diff == -1)[0]
+        # Find transitions: index i marks a change between samples i and i+1.
+        # Rising and falling edges alternate, so pad the ends and split
+        edges = np.flatnonzero(mask[:-1] != mask[1:])
         
         # Handle edge cases
         if mask[0]:
-            starts = np.concatenate([[0], starts])
+            edges = np.concatenate([[0], edges])
         if mask[-1]:
-            ends = np.concatenate([ends, [len(mask) - 1]])
+            edges = np.concatenate([edges, [len(mask) - 1]])
+        starts = edges[0::2]
+        ends = edges[1::2]
         
         # Filter by minimum duration
         events = []
@@ -196,19 +390,14 @@ class AnalysisTools:
         target_low = baseline_value + (peak_value - baseline_value) * (baseline_percent / 100)
         target_high = baseline_value + (peak_value - baseline_value) * (peak_percent / 100)
         
-        # Find indices where data crosses these targets
-        rising_portion = data[:peak_idx + 1]
-        
-        # Find 10% crossing
-        low_crossings = np.where(np.diff((rising_portion >= target_low).astype(int)) == 1)[0]
-        # Find 90% crossing
-        high_crossings = np.where(np.diff((rising_portion >= target_high).astype(int)) == 1)[0]
+        # Find the last upward crossings of both targets up to the peak
+        low_idx, high_idx = _last_crossings(
+            _kernel_array(data), peak_idx,
+            float(target_low), float(target_high)
+        )
         
-        if len(low_crossings) > 0 and len(high_crossings) > 0:
-            low_idx = low_crossings[-1]
-            high_idx = high_crossings[-1]
-            if high_idx > low_idx:
-                return time[high_idx] - time[low_idx]
+        if low_idx >= 0 and high_idx >= 0 and high_idx > low_idx:
+            return time[high_idx] - time[low_idx]
         
         return None
     
@@ -234,15 +423,11 @@ class AnalysisTools:
         peak_value = data[peak_idx]
         target_value = peak_value * (1 - decay_percent / 100)
         
-        # Look for crossing point after peak
-        decay_portion = data[peak_idx:]
-        decay_time = time[peak_idx:]
-        
-        # Find where data crosses target
-        below_target = decay_portion < target_value
-        if np.any(below_target):
-            decay_idx = np.where(below_target)[0][0]
-            return decay_time[decay_idx] - decay_time[0]
+        # Look for crossing point after peak; the scan stops at the first hit
+        decay_idx = _first_below(_kernel_array(data),
+                                 peak_idx, float(target_value))
+        if decay_idx >= 0:
+            return time[decay_idx] - time[peak_idx]
         
         return None
     
@@ -257,12 +442,39 @@ class AnalysisTools:
         baseline = np.mean(data[start_idx:end_idx])
         return data - baseline
     
+    @staticmethod
+    def decimated_baseline(baseline: np.ndarray, time: np.ndarray,
+                           factor: int = 32) -> np.ndarray:
+        """
+        Smooth a per-sample baseline on a decimated copy and interpolate it back
+        
+        The baseline is anti-alias filtered and decimated by `factor`, then
+        linearly interpolated onto the full time grid. Baselines too short to
+        decimate are returned as float64 unchanged.
+        
+        Args:
+            baseline: Baseline array (same length as time)
+            time: Time array
+            factor: Decimation factor
+        
+        Returns:
+            Baseline evaluated at every sample of time
+        """
+        baseline = np.asarray(baseline, dtype=np.float64)
+        # decimate's zero-phase FIR (order 20 * factor) needs a few filter lengths of data
+        if factor < 2 or len(baseline) < 3 * (20 * factor + 1) + 1:
+            return baseline
+        
+        short = signal.decimate(baseline, factor, ftype='fir')
+        return np.interp(time, time[::factor][:len(short)], short)
+    
     @staticmethod
     def filter_data(data: np.ndarray, 
                    filter_type: str = 'lowpass',
                    cutoff: float = 1000.0,
                    sample_rate: float = 10000.0,
-                   order: int = 4) -> np.ndarray:
+                   order: int = 4,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Filter data using Butterworth filter
         
@@ -272,28 +484,57 @@ class AnalysisTools:
             cutoff: Cutoff frequency (Hz) or (low, high) tuple for bandpass
             sample_rate: Sample rate in Hz
             order: Filter order
+            out: Optional preallocated array (same shape as data) to write the result into
         
         Returns:
-            Filtered data
+            Filtered data (out, if given)
         """
-        nyquist = sample_rate / 2
-        
-        if filter_type == 'lowpass':
-            b, a = signal.butter(order, cutoff / nyquist, 'low')
-        elif filter_type == 'highpass':
-            b, a = signal.butter(order, cutoff / nyquist, 'high')
-        elif filter_type == 'bandpass':
-            low, high = cutoff
-            b, a = signal.butter(order, [low / nyquist, high / nyquist], 'band')
-        else:
+        if filter_type == 'bandpass':
+            cutoff = tuple(cutoff)
+        sos = _butter_sos(filter_type, cutoff, sample_rate, order)
+        if sos is None:
             return data
         
-        return signal.filtfilt(b, a, data)
+        filtered_data = signal.sosfiltfilt(sos, data)
+        if out is not None:
+            out[...] = filtered_data
+            return out
+        return filtered_data
+    
+    @staticmethod
+    def filter_data_batch(data_2d: np.ndarray,
+                          filter_type: str = 'lowpass',
+                          cutoff: float = 1000.0,
+                          sample_rate: float = 10000.0,
+                          order: int = 4,
+                          axis: int = -1) -> np.ndarray:
+        """
+        Filter many sweeps at once using Butterworth filter
+        
+        Args:
+            data_2d: Data array, e.g. (sweeps x samples) from get_sweep_matrix
+            filter_type: 'lowpass', 'highpass', or 'bandpass'
+            cutoff: Cutoff frequency (Hz) or (low, high) tuple for bandpass
+            sample_rate: Sample rate in Hz
+            order: Filter order
+            axis: Axis along which to filter (the time axis)
+        
+        Returns:
+            Filtered data with the same shape as data_2d
+        """
+        if filter_type == 'bandpass':
+            cutoff = tuple(cutoff)
+        sos = _butter_sos(filter_type, cutoff, sample_rate, order)
+        if sos is None:
+            return data_2d
+        
+        return signal.sosfiltfilt(sos, data_2d, axis=axis)
     
     @staticmethod
     def gaussian_lowpass_filter(data: np.ndarray,
                                 cutoff_freq: float = 1000.0,
-                                sample_rate: float = 10000.0) -> np.ndarray:
+                                sample_rate: float = 10000.0,
+                                out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Apply Gaussian lowpass filter to data
         
@@ -306,9 +547,10 @@ class AnalysisTools:
             data: Data array
             cutoff_freq: Cutoff frequency in Hz (where response is -3dB)
             sample_rate: Sample rate in Hz
+            out: Optional preallocated array (same shape as data) to write the result into
         
         Returns:
-            Filtered data
+            Filtered data (out, if given)
         """
         if cutoff_freq <= 0 or sample_rate <= 0:
             return data
@@ -319,7 +561,7 @@ class AnalysisTools:
         # sigma_time = √ln(2) / (2π * fc) ≈ 0.1325 / fc
         # where fc is the cutoff frequency in Hz.
         #
-        # Since gaussian_filter1d uses sigma in units of samples (not time),
+        # Since the kernel uses sigma in units of samples (not time),
         # we need to convert: sigma_samples = sigma_time * sample_rate
         #
         # Therefore: sigma_samples = 0.1325 * sample_rate / cutoff_freq
@@ -333,11 +575,278 @@ class AnalysisTools:
         # This gives us the -3dB point at cutoff_freq
         sigma_samples = 0.1325 * sample_rate / cutoff_freq
         
-        # Apply Gaussian filter using scipy's gaussian_filter1d
-        # This uses convolution with a Gaussian kernel
-        filtered_data = gaussian_filter1d(data, sigma=sigma_samples, mode='reflect')
+        # Convolve with the cached Gaussian kernel. Symmetric padding matches
+        # gaussian_filter1d's 'reflect' mode, so results are identical
+        kernel = _gaussian_kernel(sigma_samples)
+        radius = len(kernel) // 2
+        padded = _padded_workspace(data, radius)
+        kernel = kernel.astype(padded.dtype, copy=False)
+        if len(kernel) >= _FFT_CONVOLVE_MIN_TAPS:
+            # Low cutoffs give kernels thousands of taps long, where direct
+            # convolution is O(N * taps); overlap-add keeps it near O(N log taps)
+            filtered_data = signal.oaconvolve(padded, kernel, mode='valid')
+        else:
+            filtered_data = np.convolve(padded, kernel, mode='valid')
         
+        if out is not None:
+            out[...] = filtered_data
+            return out
         return filtered_data
+    
+    @staticmethod
+    def gaussian_lowpass_filter_range(data: np.ndarray, start_idx: int, end_idx: int,
+                                      cutoff_freq: float = 1000.0,
+                                      sample_rate: float = 10000.0) -> np.ndarray:
+        """
+        Gaussian lowpass filter data[start_idx:end_idx] only
+        
+        Only the range plus one kernel radius of real samples on each side is
+        convolved, so the result matches filtering the whole trace and slicing.
+        
+        Args:
+            data: Full data array
+            start_idx: First sample of the range
+            end_idx: End of the range (exclusive)
+            cutoff_freq: Cutoff frequency in Hz (where response is -3dB)
+            sample_rate: Sample rate in Hz
+        
+        Returns:
+            Filtered samples of the range (end_idx - start_idx values)
+        """
+        if cutoff_freq <= 0 or sample_rate <= 0 or cutoff_freq >= sample_rate / 2:
+            return data[start_idx:end_idx].copy()
+        
+        radius = len(_gaussian_kernel(0.1325 * sample_rate / cutoff_freq)) // 2
+        window_start = max(0, start_idx - radius)
+        window_end = min(len(data), end_idx + radius)
+        filtered = AnalysisTools.gaussian_lowpass_filter(
+            data[window_start:window_end], cutoff_freq=cutoff_freq, sample_rate=sample_rate
+        )
+        return filtered[start_idx - window_start:end_idx - window_start]
+    
+    @staticmethod
+    def peak_downsample(time: np.ndarray, data: np.ndarray,
+                        factor: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Min/max (peak) downsample a trace for display
+        
+        Each block of `factor` samples is replaced by two points holding the block
+        maximum and minimum, both placed at the time of the block's first sample,
+        so spikes stay visible at any zoom level.
+        
+        Args:
+            time: Time array
+            data: Data array
+            factor: Samples per block
+        
+        Returns:
+            Tuple of (time, data) arrays with 2 * ceil(len / factor) points
+        """
+        n = min(len(time), len(data))
+        factor = max(1, int(factor))
+        data = _kernel_array(data[:n])
+        
+        n_blocks = (n + factor - 1) // factor
+        y_ds = np.empty(2 * n_blocks, dtype=data.dtype)
+        _peak_downsample(data, factor, y_ds)
+        x_ds = np.repeat(np.asarray(time[:n])[::factor], 2)
+        return x_ds, y_ds
+
+
+@njit(cache=True, nogil=True)
+def _last_crossings(data, end_idx, target_low, target_high):
+    """
+    Last upward crossings of two targets within data[:end_idx + 1]
+    
+    A crossing at i means data[i] is below the target and data[i + 1] reaches it.
+    Returns -1 for a target that is never crossed.
+    """
+    last_low = -1
+    last_high = -1
+    for i in range(end_idx):
+        current = data[i]
+        following = data[i + 1]
+        if not (current >= target_low) and following >= target_low:
+            last_low = i
+        if not (current >= target_high) and following >= target_high:
+            last_high = i
+    return last_low, last_high
+
+
+@njit(cache=True, nogil=True)
+def _first_below(data, start_idx, target):
+    """Index of the first sample at or after start_idx below target, or -1"""
+    for i in range(start_idx, data.shape[0]):
+        if data[i] < target:
+            return i
+    return -1
+
+
+@njit(cache=True, nogil=True)
+def _masked_std(data, center, limit):
+    """Count and std of samples with |x - center| < limit, without a mask copy"""
+    count = 0
+    total = 0.0
+    for i in range(data.shape[0]):
+        if abs(data[i] - center) < limit:
+            count += 1
+            total += data[i]
+    if count == 0:
+        return 0, np.nan
+    
+    mean = total / count
+    sum_sq = 0.0
+    for i in range(data.shape[0]):
+        if abs(data[i] - center) < limit:
+            diff = data[i] - mean
+            sum_sq += diff * diff
+    return count, np.sqrt(sum_sq / count)
+
+
+@njit(cache=True, nogil=True)
+def _peak_downsample(data, factor, out):
+    """Write interleaved (max, min) pairs of each factor-sample block into out"""
+    n = data.shape[0]
+    block = 0
+    for start in range(0, n, factor):
+        stop = min(start + factor, n)
+        high = data[start]
+        low = data[start]
+        for i in range(start + 1, stop):
+            value = data[i]
+            if value > high:
+                high = value
+            elif value < low:
+                low = value
+        out[2 * block] = high
+        out[2 * block + 1] = low
+        block += 1
+
+
+@njit(cache=True, nogil=True)
+def _scan_blocks(data, baseline, block_thr, sign, min_samples):
+    """
+    Scan a trace once for block events
+    
+    A sample is in a block when it lies between the threshold and 0 (sign -1/1),
+    or within block_thr of 0 (sign 0). Each run ends at the first sample after it,
+    or at the last sample if the run reaches the end of the trace. The block mean
+    covers data[start:end+1].
+    
+    Returns:
+        Tuple of (start indices, end indices, mean amplitudes) for runs that
+        span at least min_samples
+    """
+    n = data.shape[0]
+    capacity = 16
+    starts = np.empty(capacity, dtype=np.int64)
+    ends = np.empty(capacity, dtype=np.int64)
+    means = np.empty(capacity, dtype=np.float64)
+    count = 0
+    abs_baseline = abs(baseline)
+    
+    run_start = -1
+    sum_accum = 0.0
+    value = 0.0
+    for i in range(n + 1):
+        if i < n:
+            value = data[i]
+            if sign < 0:
+                inside = value > block_thr and value < 0.0 and abs(value) < abs_baseline
+            elif sign > 0:
+                inside = value < block_thr and value > 0.0 and abs(value) < abs_baseline
+            else:
+                inside = abs(value) < block_thr
+        else:
+            inside = False
+        
+        if inside:
+            if run_start < 0:
+                run_start = i
+                sum_accum = 0.0
+            sum_accum += value
+            continue
+        if run_start < 0:
+            continue
+        
+        # Run finished: end is the first sample after it, or the last sample
+        if i < n:
+            end = i
+            sum_accum += data[i]
+        else:
+            end = n - 1
+        if end - run_start >= min_samples:
+            if count == capacity:
+                capacity *= 2
+                new_starts = np.empty(capacity, dtype=np.int64)
+                new_ends = np.empty(capacity, dtype=np.int64)
+                new_means = np.empty(capacity, dtype=np.float64)
+                new_starts[:count] = starts[:count]
+                new_ends[:count] = ends[:count]
+                new_means[:count] = means[:count]
+                starts = new_starts
+                ends = new_ends
+                means = new_means
+            starts[count] = run_start
+            ends[count] = end
+            means[count] = sum_accum / (end - run_start + 1)
+            count += 1
+        run_start = -1
+    
+    return starts[:count], ends[:count], means[:count]
+
+
+def _map_sweeps(func, sweeps: List) -> List:
+    """func applied to each sweep; sweeps are independent and the scan kernels
+    release the GIL, so they are processed on a thread pool"""
+    # Without numba the kernels are plain Python holding the GIL, and threads only add overhead
+    max_workers = min(os.cpu_count() or 1, len(sweeps)) if NUMBA_AVAILABLE else 1
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, sweeps))
+    return [func(sweep) for sweep in sweeps]
+
+
+def _insert_windows(n_samples: int, baseline_start: float, baseline_end: float,
+                    response_start: float, response_end: float) -> Optional[Tuple[slice, slice]]:
+    """Baseline and response sample windows for sweeps of n_samples (None if either is empty)"""
+    baseline_start_idx = max(0, int(baseline_start * n_samples))
+    baseline_end_idx = min(n_samples, int(baseline_end * n_samples))
+    response_start_idx = max(0, int(response_start * n_samples))
+    response_end_idx = min(n_samples, int(response_end * n_samples))
+    
+    if baseline_end_idx <= baseline_start_idx or response_end_idx <= response_start_idx:
+        return None
+    return slice(baseline_start_idx, baseline_end_idx), slice(response_start_idx, response_end_idx)
+
+
+def _window_inserts(baseline_data: np.ndarray, response_data: np.ndarray,
+                    sweep_numbers: List[int], threshold_factor: float) -> List[Dict]:
+    """Insert dictionaries for the rows of (sweeps x samples) baseline/response windows"""
+    # Calculate baseline and response statistics for all sweeps at once
+    baseline_mean = baseline_data.mean(axis=1)
+    baseline_std = baseline_data.std(axis=1)
+    response_mean = response_data.mean(axis=1)
+    response_max = response_data.max(axis=1)
+    response_min = response_data.min(axis=1)
+    
+    # Detect if response deviates significantly from baseline
+    threshold = np.abs(baseline_mean) + (threshold_factor * baseline_std)
+    deviation = np.maximum(np.abs(response_max - baseline_mean),
+                           np.abs(response_min - baseline_mean))
+    
+    return [
+        {
+            'sweep': int(sweep_numbers[row]),
+            'baseline_mean': baseline_mean[row],
+            'baseline_std': baseline_std[row],
+            'response_mean': response_mean[row],
+            'response_max': response_max[row],
+            'response_min': response_min[row],
+            'deviation': deviation[row]
+        }
+        for row in np.flatnonzero(deviation > threshold)
+    ]
 
 
 class BlockDetector:
@@ -348,7 +857,7 @@ class BlockDetector:
                      time: np.ndarray,
                      baseline_threshold: float = None,
                      block_threshold_factor: float = 2.0,
-                     min_block_duration: float = 0.001) -> List[Dict]:
+                     min_block_duration: float = 0.001) -> BlockEvents:
         """
         Detect block events in a single trace
         
@@ -367,7 +876,8 @@ class BlockDetector:
             min_block_duration: Minimum duration for a block event (seconds)
         
         Returns:
-            List of block event dictionaries, each containing:
+            BlockEvents with one array element per block (as_records() gives
+            the equivalent list of dictionaries):
             - start_time: Block start time (seconds)
             - end_time: Block end time (seconds)
             - duration: Block duration (seconds)
@@ -378,31 +888,34 @@ class BlockDetector:
             - block_depth: Difference between baseline and block amplitude
         """
         if len(data) == 0 or len(time) == 0:
-            return []
+            return BlockEvents.empty()
         
         # Estimate baseline (open channel level)
         if baseline_threshold is None:
-            # Use histogram to find the most common (open) level
-            hist, bin_edges = np.histogram(data, bins=100)
-            max_bin_idx = np.argmax(hist)
-            baseline_amplitude = (bin_edges[max_bin_idx] + bin_edges[max_bin_idx + 1]) / 2
-            
-            # Alternative: use median or mean of upper portion
-            # Sort data and take median of upper half
-            sorted_data = np.sort(data)
-            upper_half = sorted_data[len(sorted_data)//2:]
-            baseline_amplitude = np.median(upper_half)
+            # Median of the upper half of the sorted data. Only the one or two
+            # order statistics that median needs are selected, not a full sort
+            n = len(data)
+            upper_start = n // 2
+            upper_len = n - upper_start
+            lower_mid = upper_start + (upper_len - 1) // 2
+            upper_mid = upper_start + upper_len // 2
+            partitioned = np.partition(data, (lower_mid, upper_mid))
+            baseline_amplitude = (partitioned[lower_mid] + partitioned[upper_mid]) / 2
         else:
             baseline_amplitude = baseline_threshold
         
         # Calculate standard deviation of baseline region
         # Use data points near baseline for std calculation
-        baseline_mask = np.abs(data - baseline_amplitude) < (np.std(data) * 1.5)
-        if np.sum(baseline_mask) < 10:
+        overall_std = np.std(data)
+        near_count, near_std = _masked_std(
+            _kernel_array(data),
+            float(baseline_amplitude), float(overall_std * 1.5)
+        )
+        if near_count < 10:
             # Fallback: use overall std
-            baseline_std = np.std(data)
+            baseline_std = overall_std
         else:
-            baseline_std = np.std(data[baseline_mask])
+            baseline_std = near_std
         
         # Block detection: blocks move toward 0 from baseline
         # If baseline is negative, blocks are between baseline and 0 (closer to 0)
@@ -411,82 +924,51 @@ class BlockDetector:
         # Determine block region based on baseline sign
         if baseline_amplitude < 0:
             # Negative baseline: blocks are between baseline and 0 (less negative)
-            # Block threshold is closer to 0 than baseline
-            block_threshold = baseline_amplitude + (block_threshold_factor * baseline_std)
-            # But block must still be between baseline and 0
-            block_threshold = min(block_threshold, 0.0)
-            # Detect points that are between baseline and threshold (closer to 0)
-            in_block = (data > block_threshold) & (data < 0) & (np.abs(data) < np.abs(baseline_amplitude))
+            # Block threshold is closer to 0 than baseline, but not past 0
+            block_threshold = min(baseline_amplitude + (block_threshold_factor * baseline_std), 0.0)
+            sign = -1
         elif baseline_amplitude > 0:
             # Positive baseline: blocks are between baseline and 0 (less positive)
-            # Block threshold is closer to 0 than baseline
-            block_threshold = baseline_amplitude - (block_threshold_factor * baseline_std)
-            # But block must still be between baseline and 0
-            block_threshold = max(block_threshold, 0.0)
-            # Detect points that are between threshold and baseline (closer to 0)
-            in_block = (data < block_threshold) & (data > 0) & (np.abs(data) < np.abs(baseline_amplitude))
+            # Block threshold is closer to 0 than baseline, but not past 0
+            block_threshold = max(baseline_amplitude - (block_threshold_factor * baseline_std), 0.0)
+            sign = 1
         else:
             # Baseline is exactly 0 - shouldn't happen, but handle gracefully
             # In this case, look for small deviations
             block_threshold = block_threshold_factor * baseline_std
-            in_block = np.abs(data) < block_threshold
-        
-        # Find transitions into and out of blocks
-        diff = np.diff(in_block.astype(int))
-        block_starts = np.where(diff == 1)[0] + 1  # +1 because diff shifts indices
-        block_ends = np.where(diff == -1)[0] + 1
-        
-        # Handle edge cases
-        if in_block[0]:
-            block_starts = np.concatenate([[0], block_starts])
-        if in_block[-1]:
-            block_ends = np.concatenate([block_ends, [len(data) - 1]])
-        
-        # Ensure we have matching starts and ends
-        if len(block_starts) > len(block_ends):
-            block_ends = np.concatenate([block_ends, [len(data) - 1]])
-        if len(block_ends) > len(block_starts):
-            block_starts = np.concatenate([[0], block_starts])
+            sign = 0
         
         # Convert min_block_duration to samples
         sample_rate = len(time) / (time[-1] - time[0]) if len(time) > 1 else 1
         min_block_samples = int(min_block_duration * sample_rate)
         
-        # Process each detected block
-        blocks = []
-        for start_idx, end_idx in zip(block_starts, block_ends):
-            if end_idx - start_idx < min_block_samples:
-                continue
-            
-            block_data = data[start_idx:end_idx+1]
-            block_time = time[start_idx:end_idx+1]
-            
-            # Calculate block properties
-            start_time = time[start_idx]
-            end_time = time[end_idx]
-            duration = end_time - start_time
-            average_amplitude = np.mean(block_data)
+        # Find block boundaries and mean amplitudes in a single pass
+        block_starts, block_ends, block_means = _scan_blocks(
+            _kernel_array(data),
+            float(baseline_amplitude), float(block_threshold), sign, min_block_samples
+        )
+        
+        # Calculate block properties for all blocks at once
+        start_time = time[block_starts]
+        end_time = time[block_ends]
+        
+        return BlockEvents(
+            start_idx=block_starts,
+            end_idx=block_ends,
+            start_time=start_time,
+            end_time=end_time,
+            duration=end_time - start_time,
+            average_amplitude=block_means,
+            baseline_amplitude=np.full(len(block_starts), baseline_amplitude, dtype=np.float64),
             # Block depth: how much closer to 0 than baseline
-            block_depth = abs(baseline_amplitude) - abs(average_amplitude)
-            
-            blocks.append({
-                'start_time': start_time,
-                'end_time': end_time,
-                'duration': duration,
-                'start_idx': int(start_idx),
-                'end_idx': int(end_idx),
-                'average_amplitude': average_amplitude,
-                'baseline_amplitude': baseline_amplitude,
-                'block_depth': block_depth
-            })
-        
-        return blocks
+            block_depth=abs(baseline_amplitude) - np.abs(block_means)
+        )
     
     @staticmethod
     def detect_blocks_multiple_sweeps(sweep_data_list: List,
                                      baseline_threshold: float = None,
                                      block_threshold_factor: float = 3.0,
-                                     min_block_duration: float = 0.001) -> List[Dict]:
+                                     min_block_duration: float = 0.001) -> BlockEvents:
         """
         Detect block events across multiple sweeps
         
@@ -497,26 +979,67 @@ class BlockDetector:
             min_block_duration: Minimum duration for a block event (seconds)
         
         Returns:
-            List of all block events from all sweeps with sweep number included
+            BlockEvents from all sweeps, with sweep_number and channel filled in
         """
-        all_blocks = []
-        
-        for sweep in sweep_data_list:
-            blocks = BlockDetector.detect_blocks(
+        def detect_sweep(sweep):
+            return BlockDetector.detect_blocks(
                 sweep.data,
                 sweep.time,
                 baseline_threshold=baseline_threshold,
                 block_threshold_factor=block_threshold_factor,
                 min_block_duration=min_block_duration
             )
-            
-            # Add sweep information to each block
-            for block in blocks:
-                block['sweep_number'] = sweep.sweep_number
-                block['channel'] = sweep.channel
-                all_blocks.append(block)
         
-        return all_blocks
+        sweep_blocks = _map_sweeps(detect_sweep, sweep_data_list)
+        
+        # Add sweep information to each block
+        for sweep, blocks in zip(sweep_data_list, sweep_blocks):
+            blocks.sweep_number = np.full(len(blocks), sweep.sweep_number, dtype=np.int64)
+            blocks.channel = np.full(len(blocks), sweep.channel, dtype=np.int64)
+        
+        return BlockEvents.concatenate(sweep_blocks)
+    
+    @staticmethod
+    def detect_blocks_matrix(data: np.ndarray, time: np.ndarray,
+                             sweep_numbers: Optional[np.ndarray] = None,
+                             channel: int = 0,
+                             baseline_threshold: float = None,
+                             block_threshold_factor: float = 3.0,
+                             min_block_duration: float = 0.001) -> BlockEvents:
+        """
+        Detect block events in every sweep of a (sweeps x samples) array
+        
+        Args:
+            data: One row per sweep, all sharing the time base
+            time: Time array (one value per column of data)
+            sweep_numbers: Sweep number of each row (defaults to the row index)
+            channel: Channel the sweeps were recorded on
+            baseline_threshold: Optional manual baseline threshold
+            block_threshold_factor: Factor for block detection
+            min_block_duration: Minimum duration for a block event (seconds)
+        
+        Returns:
+            BlockEvents from all sweeps, with sweep_number and channel filled in
+        """
+        if sweep_numbers is None:
+            sweep_numbers = np.arange(data.shape[0])
+        
+        def detect_row(row):
+            return BlockDetector.detect_blocks(
+                row,
+                time,
+                baseline_threshold=baseline_threshold,
+                block_threshold_factor=block_threshold_factor,
+                min_block_duration=min_block_duration
+            )
+        
+        sweep_blocks = _map_sweeps(detect_row, list(data))
+        
+        for sweep_number, blocks in zip(sweep_numbers, sweep_blocks):
+            blocks.sweep_number = np.full(len(blocks), sweep_number, dtype=np.int64)
+            blocks.channel = np.full(len(blocks), channel, dtype=np.int64)
+        
+        return BlockEvents.concatenate(sweep_blocks)
     
     @staticmethod
     def detect_inserts(sweep_data_list: List,
@@ -542,50 +1065,67 @@ class BlockDetector:
         if len(sweep_data_list) == 0:
             return []
         
+        # Group sweeps by length so each group's windows can be reduced in one go
+        sweeps_by_length = {}
+        for i, sweep in enumerate(sweep_data_list):
+            sweeps_by_length.setdefault(len(sweep.data), []).append(i)
+        
         inserts = []
         
-        for i, sweep in enumerate(sweep_data_list):
-            # Calculate indices for windows
-            baseline_start_idx = int(baseline_start * len(sweep.data))
-            baseline_end_idx = int(baseline_end * len(sweep.data))
-            response_start_idx = int(response_start * len(sweep.data))
-            response_end_idx = int(response_end * len(sweep.data))
-            
-            # Ensure valid indices
-            baseline_start_idx = max(0, baseline_start_idx)
-            baseline_end_idx = min(len(sweep.data), baseline_end_idx)
-            response_start_idx = max(0, response_start_idx)
-            response_end_idx = min(len(sweep.data), response_end_idx)
-            
-            if baseline_end_idx <= baseline_start_idx or response_end_idx <= response_start_idx:
+        for n_samples, sweep_indices in sweeps_by_length.items():
+            windows = _insert_windows(n_samples, baseline_start, baseline_end,
+                                      response_start, response_end)
+            if windows is None:
                 continue
+            baseline_window, response_window = windows
             
-            # Calculate baseline statistics
-            baseline_data = sweep.data[baseline_start_idx:baseline_end_idx]
-            baseline_mean = np.mean(baseline_data)
-            baseline_std = np.std(baseline_data)
+            # (sweeps x samples) copies of just the two windows
+            baseline_data = np.stack([sweep_data_list[i].data[baseline_window]
+                                      for i in sweep_indices])
+            response_data = np.stack([sweep_data_list[i].data[response_window]
+                                      for i in sweep_indices])
             
-            # Calculate response statistics
-            response_data = sweep.data[response_start_idx:response_end_idx]
-            response_mean = np.mean(response_data)
-            response_max = np.max(response_data)
-            response_min = np.min(response_data)
-            
-            # Detect if response deviates significantly from baseline
-            threshold = abs(baseline_mean) + (threshold_factor * baseline_std)
-            deviation = max(abs(response_max - baseline_mean), 
-                          abs(response_min - baseline_mean))
-            
-            if deviation > threshold:
-                inserts.append({
-                    'sweep': i,
-                    'baseline_mean': baseline_mean,
-                    'baseline_std': baseline_std,
-                    'response_mean': response_mean,
-                    'response_max': response_max,
-                    'response_min': response_min,
-                    'deviation': deviation
-                })
+            inserts.extend(_window_inserts(baseline_data, response_data,
+                                           sweep_indices, threshold_factor))
+        
+        if len(sweeps_by_length) > 1:
+            inserts.sort(key=lambda insert: insert['sweep'])
         
         return inserts
+    
+    @staticmethod
+    def detect_inserts_matrix(data: np.ndarray,
+                              sweep_numbers: Optional[np.ndarray] = None,
+                              baseline_start: float = 0.0,
+                              baseline_end: float = 0.1,
+                              response_start: float = 0.1,
+                              response_end: float = 0.2,
+                              threshold_factor: float = 3.0) -> List[Dict]:
+        """
+        Detect inserts/responses in every sweep of a (sweeps x samples) array
+        
+        Args:
+            data: One row per sweep, all of the same length
+            sweep_numbers: Sweep number of each row (defaults to the row index)
+            baseline_start: Start time for baseline window (fraction of sweep)
+            baseline_end: End time for baseline window (fraction of sweep)
+            response_start: Start time for response window (fraction of sweep)
+            response_end: End time for response window (fraction of sweep)
+            threshold_factor: Factor for threshold (e.g., 3 = 3x baseline std)
+        
+        Returns:
+            List of insert dictionaries with sweep indices
+        """
+        if sweep_numbers is None:
+            sweep_numbers = np.arange(data.shape[0])
+        
+        windows = _insert_windows(data.shape[1], baseline_start, baseline_end,
+                                  response_start, response_end)
+        if data.shape[0] == 0 or windows is None:
+            return []
+        baseline_window, response_window = windows
+        
+        # The windows are column slices, so no sweep data is copied
+        return _window_inserts(data[:, baseline_window], data[:, response_window],
+                               sweep_numbers, threshold_factor)
 
@@ -4,32 +4,15 @@ Cross-platform ABF file viewer and analyzer
 """
 import sys
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 
-# Enable high DPI scaling for better appearance on modern displays
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QPalette
 
-from viewer import ABFViewerMainWindow
-
-
-def main():
-    """Main entry point"""
-    # Enable high DPI support
-    QApplication.setHighDpiScaleFactorRoundingPolicy(
-        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
-    )
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
-    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
-    
-    app = QApplication(sys.argv)
-    app.setApplicationName("Synapse ABF Viewer")
-    app.setOrganizationName("Synapse")
+def _light_palette():
+    """Light palette applied regardless of system theme"""
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QPalette
     
-    # Force light mode regardless of system theme
-    app.setStyle('Fusion')  # Use Fusion style for consistent cross-platform appearance
-    
-    # Set light palette
     palette = QPalette()
     # Window colors (background)
     palette.setColor(QPalette.ColorRole.Window, Qt.GlobalColor.white)
@@ -51,21 +34,118 @@ def main():
     palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, Qt.GlobalColor.gray)
     palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, Qt.GlobalColor.gray)
     
-    app.setPalette(palette)
+    return palette
+
+
+def _parse_abf(file_path: str):
+    """Parse an ABF file (runs on a worker thread)"""
+    import pyabf
+    return pyabf.ABF(file_path)
+
+
+def _select_platform_plugin():
+    """
+    Name the Qt platform plugin up front on Linux so Qt doesn't probe for one.
+    An explicit QT_QPA_PLATFORM from the user always wins.
+    """
+    if not sys.platform.startswith('linux') or 'QT_QPA_PLATFORM' in os.environ:
+        return
+    if os.environ.get('WAYLAND_DISPLAY'):
+        # Fall back to XWayland if the wayland plugin can't start
+        os.environ['QT_QPA_PLATFORM'] = 'wayland;xcb'
+    elif os.environ.get('DISPLAY'):
+        os.environ['QT_QPA_PLATFORM'] = 'xcb'
+
+
+def main():
+    """Main entry point"""
+    # Validate a command-line file before paying for any Qt initialisation.
+    # One stat call both checks existence and rules out directories
+    file_path = sys.argv[1] if len(sys.argv) > 1 else None
+    try:
+        is_file = file_path is not None and stat.S_ISREG(os.stat(file_path).st_mode)
+    except OSError:
+        is_file = False
+    if is_file and not file_path.lower().endswith('.abf'):
+        print(f"Not an ABF file: {file_path}", file=sys.stderr)
+        sys.exit(2)
+    
+    # Start parsing the file right away; it overlaps with the Qt/viewer
+    # imports and widget construction below
+    preload = None
+    if is_file:
+        executor = ThreadPoolExecutor(max_workers=1)
+        preload = executor.submit(_parse_abf, file_path)
+        executor.shutdown(wait=False)
+    
+    _select_platform_plugin()
+    
+    # Qt and the viewer are imported here rather than at module level so that
+    # the heavy viewer module graph (pyabf, scipy, pyqtgraph) loads only after
+    # QApplication exists
+    import shiboken6
+    from PySide6.QtCore import Qt, QTimer, QEvent
+    from PySide6.QtWidgets import QApplication
+    
+    # Enable high DPI support (Qt 6 always scales and uses high DPI pixmaps;
+    # only the rounding policy still needs to be set)
+    QApplication.setHighDpiScaleFactorRoundingPolicy(
+        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+    )
+    
+    # Names are static and set before construction, so anything QApplication
+    # resolves during startup (settings paths, style) already sees them
+    QApplication.setOrganizationName("Synapse")
+    QApplication.setApplicationName("Synapse ABF Viewer")
+    
+    app = QApplication(sys.argv)
+    
+    # Force light mode regardless of system theme
+    # Use Fusion style for consistent cross-platform appearance (skip the
+    # re-polish if the platform already picked it)
+    if app.style().objectName().lower() != 'fusion':
+        app.setStyle('Fusion')
+    
+    # Set light palette before any widget exists so nothing is re-polished,
+    # and only when the platform palette is not already identical
+    palette = _light_palette()
+    if app.palette() != palette:
+        app.setPalette(palette)
+    
+    from viewer import ABFViewerMainWindow
     
     # Create and show main window
     window = ABFViewerMainWindow()
     window.show()
     
     # Handle file opening from command line
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
-        if os.path.exists(file_path):
-            window.abf_handler.load_file(file_path)
-            window.current_file_path = file_path
-            window._update_ui()
+    if preload is not None:
+        def load_command_line_file():
+            try:
+                abf = preload.result()
+            except Exception as e:
+                print(f"Error loading ABF file: {e}")
+                return
+            window.abf_handler.adopt_preparsed(abf, file_path)
+            window._update_ui(current_file_path=file_path)
+        
+        # Load once the event loop is running so the window paints first
+        QTimer.singleShot(0, load_command_line_file)
+    
+    exit_code = app.exec()
+    if os.environ.get('SYNAPSE_CLEAN_EXIT'):
+        # Full interpreter shutdown (atexit handlers, coverage, leak checks)
+        sys.exit(exit_code)
     
-    sys.exit(app.exec())
+    # Tear down the Qt side properly (this also hands clipboard contents to the
+    # system clipboard manager), then skip garbage-collecting every remaining
+    # Python object and module during interpreter finalisation
+    window.deleteLater()
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    shiboken6.delete(app)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -4,25 +4,34 @@ Cross-platform ABF viewer and analyzer with professional electrophysiology inter
 """
 import sys
 import os
+import csv
+import io
+import struct
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Union, Sequence
 import numpy as np
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QMenuBar, QToolBar, QStatusBar,
                                QFileDialog, QLabel, QSpinBox, QComboBox, QPushButton,
-                               QSplitter, QTableWidget, QTableWidgetItem, QGroupBox,
+                               QSplitter, QTableView, QHeaderView, QGroupBox,
                                QScrollArea, QMessageBox, QDialog, QDialogButtonBox,
-                               QFormLayout, QDoubleSpinBox, QCheckBox, QTextEdit,
-                               QSizePolicy, QColorDialog, QFrame)
-from PySide6.QtCore import Qt, QTimer, Signal, Slot, QRectF, QPointF
-from PySide6.QtGui import QAction, QIcon, QFont, QPainter, QPolygonF, QColor
+                               QFormLayout, QGridLayout, QDoubleSpinBox, QCheckBox, QTextEdit,
+                               QSizePolicy, QColorDialog, QFrame, QGraphicsItem,
+                               QProgressDialog)
+from PySide6.QtCore import (Qt, QTimer, Signal, Slot, QRectF, QPointF,
+                            QAbstractTableModel, QModelIndex, QSignalBlocker)
+from PySide6.QtGui import QAction, QIcon, QPainter, QPolygonF, QColor
 
 import pyqtgraph as pg
 from pyqtgraph import PlotWidget, PlotItem, ViewBox, LinearRegionItem
 
 from abf_handler import ABFHandler, SweepData
-from analysis_tools import AnalysisTools, Peak, Measurement, BlockDetector
+from analysis_tools import (AnalysisTools, Peak, Measurement, BlockDetector, BlockEvents,
+                            BlockDetectionParams)
 
 # Try to import ABF writing capability
 try:
@@ -31,21 +40,36 @@ try:
 except ImportError:
     ABF_WRITE_AVAILABLE = False
 
+# Use OpenGL line rendering when PyOpenGL is installed (headless installs keep QPainter)
+try:
+    import OpenGL  # noqa: F401
+    OPENGL_AVAILABLE = True
+except ImportError:
+    OPENGL_AVAILABLE = False
+
+if OPENGL_AVAILABLE:
+    pg.setConfigOptions(useOpenGL=True, antialias=False, enableExperimental=True)
+
 
 class ZoomButton(QWidget):
     """Small + or - button for axis zooming"""
     clicked = Signal()
     
+    _PEN = pg.mkPen('k', width=1.5)
+    
     def __init__(self, zoom_type: str = '+', parent=None):
         super().__init__(parent)
         self.zoom_type = zoom_type  # '+' or '-'
         self.setFixedSize(18, 18)
         self.setCursor(Qt.PointingHandCursor)
+        # paintEvent fills the whole rect, so Qt can skip erasing the background
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
     
     def paintEvent(self, event):
         painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(pg.mkPen('k', width=1.5))
+        painter.setPen(self._PEN)
         
         w, h = self.width(), self.height()
         center_x, center_y = w / 2, h / 2
@@ -54,11 +78,6 @@ class ZoomButton(QWidget):
         painter.drawRect(1, 1, w - 2, h - 2)
         
         # Draw + or -
-        font = QFont()
-        font.setPointSize(10)
-        font.setBold(True)
-        painter.setFont(font)
-        
         if self.zoom_type == '+':
             # Draw horizontal line
             painter.drawLine(center_x - 4, center_y, center_x + 4, center_y)
@@ -77,17 +96,23 @@ class ZoomArrowButton(QWidget):
     """Small arrow button for axis panning"""
     clicked = Signal()
     
+    _PEN = pg.mkPen('k', width=1)
+    _BRUSH = pg.mkBrush('k')
+    
     def __init__(self, direction: str = 'up', parent=None):
         super().__init__(parent)
         self.direction = direction  # 'up', 'down', 'left', 'right'
         self.setFixedSize(12, 12)
         self.setCursor(Qt.PointingHandCursor)
+        # paintEvent fills the whole rect, so Qt can skip erasing the background
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
     
     def paintEvent(self, event):
         painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(pg.mkPen('k', width=1))
-        painter.setBrush(pg.mkBrush('k'))
+        painter.setPen(self._PEN)
+        painter.setBrush(self._BRUSH)
         
         w, h = self.width(), self.height()
         center_x, center_y = w / 2, h / 2
@@ -126,13 +151,24 @@ class ZoomArrowButton(QWidget):
 
 class TracePlotWidget(PlotWidget):
     """Custom plot widget with axis arrows for zooming"""
-    cursor_moved = Signal(float, float)  # x, y
+    cursor_moved = Signal(int, float, float)  # cursor id (1 or 2), x, y
     cursor1_set = Signal(float, float)
     cursor2_set = Signal(float, float)
     
+    # Min/max downsampling factors precomputed for long uniformly sampled traces
+    LOD_FACTORS = (8, 64)
+    LOD_MIN_SAMPLES = 100000
+    
+    # Cursor pens (red for cursor 1, blue for cursor 2, lighter on hover)
+    _CURSOR_PENS = {1: pg.mkPen('r', width=2), 2: pg.mkPen('b', width=2)}
+    _CURSOR_HOVER_PENS = {1: pg.mkPen((255, 180, 180), width=2), 2: pg.mkPen((180, 180, 255), width=2)}
+    
     def __init__(self, channel_label: str = "", parent=None):
         super().__init__(parent)
         
+        if OPENGL_AVAILABLE:
+            self.useOpenGL(True)
+        
         # Set white background style
         self.setBackground('w')
         self.getAxis('left').setPen(pg.mkPen('k', width=1))
@@ -151,9 +187,9 @@ class TracePlotWidget(PlotWidget):
         self.setMouseEnabled(x=True, y=True)
         self.setMenuEnabled(False)  # Disable right-click menu
         
-        # Configure viewbox for better interaction
-        vb = self.getViewBox()
-        vb.setMouseMode(pg.ViewBox.PanMode)  # Left click drag pans
+        # Configure viewbox for better interaction (kept for the zoom, pan and cursor paths)
+        self._vb = self.getViewBox()
+        self._vb.setMouseMode(pg.ViewBox.PanMode)  # Left click drag pans
         
         
         # Store channel label
@@ -165,143 +201,187 @@ class TracePlotWidget(PlotWidget):
         self.cursor1_enabled = False
         self.cursor2_enabled = False
         self.cursors_locked = False  # When locked, cursors move together maintaining distance
-        
-        # Data plot
-        self.data_plot: Optional[pg.PlotDataItem] = None
-        self.command_plot: Optional[pg.PlotDataItem] = None
+        self._cursor_distance = 0.0  # Cursor 2 minus cursor 1, captured on the first locked move
+        self._cursor_distance_set = False
         
         # Store current data
         self.current_time: Optional[np.ndarray] = None
         self.current_data: Optional[np.ndarray] = None
         self.current_command: Optional[np.ndarray] = None
-    
-    def plot_sweep(self, sweep_data: SweepData, show_command: bool = False, baseline_offset: float = 0.0):
+        self._data_buf: Optional[np.ndarray] = None  # Reused baseline-corrected trace buffer
+        
+        # Uniform sampling grid of current_time (None if not uniform)
+        self._t0: Optional[float] = None
+        self._dt: Optional[float] = None
+        
+        # Downsampled (factor, time, data) levels of the current trace
+        self._lod_levels: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        self._lod_factor = 1
+        
+        # Cursor moves are coalesced so at most one update is emitted per frame
+        self._pending_cursors: Dict[int, Tuple[float, float]] = {}
+        self._cursor_emit_timer = QTimer(self)
+        self._cursor_emit_timer.setSingleShot(True)
+        self._cursor_emit_timer.setInterval(16)
+        self._cursor_emit_timer.timeout.connect(self._emit_cursor_positions)
+        
+        # Data and command plots are created once and updated with setData
+        self._trace_pen = pg.mkPen(self.trace_color, width=1.5)
+        self._command_pen = pg.mkPen('k', width=1, style=Qt.PenStyle.DotLine)
+        # ABF ADC traces are finite, so pyqtgraph's per-setData isfinite pass is skipped
+        # and the polyline is drawn as one connected, non-antialiased path
+        self.data_plot: pg.PlotDataItem = self.plot([], [], pen=self._trace_pen, antialias=False,
+                                                    connect='all', skipFiniteCheck=True)
+        self.data_plot.setClipToView(True)  # Only render visible data points
+        # Command waveforms keep the finite check: ABF1 files (e.g. written by
+        # save_as_abf) load with an all-NaN sweepC
+        self.command_plot: pg.PlotDataItem = self.plot([], [], pen=self._command_pen, antialias=False,
+                                                       connect='all')
+        self.command_plot.setClipToView(True)
+        self._enable_auto_downsampling(self.command_plot)
+        self.command_plot.setVisible(False)
+        
+        # On the QPainter path, let Qt keep the stroked traces as device pixmaps so that
+        # repaints caused by other items (cursor drags, markers) reuse them. Any x-range
+        # change still re-renders the curve, since clip-to-view reloads its data. Not used
+        # with OpenGL, where the pixmap cache would force the curves back to raster drawing
+        if not OPENGL_AVAILABLE:
+            self.data_plot.curve.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+            self.command_plot.curve.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        
+        # Peak and block markers: one scatter item each plus a pool of block regions
+        # Minimum/maximum peak styles as object arrays, indexed by is_max
+        self._peak_brushes = np.array([pg.mkBrush('r'), pg.mkBrush('g')], dtype=object)
+        self._peak_pens = np.array([pg.mkPen('r', width=2), pg.mkPen('g', width=2)], dtype=object)
+        self._peak_scatter = pg.ScatterPlotItem(symbol='o', size=10)
+        self.addItem(self._peak_scatter)
+        self._block_scatter = pg.ScatterPlotItem(symbol='s', size=8,
+                                                 pen=pg.mkPen('orange', width=2),
+                                                 brush=pg.mkBrush('orange'))
+        self.addItem(self._block_scatter)
+        self._block_regions: List[LinearRegionItem] = []
+        # What the markers currently show (None when cleared), so repeated
+        # mark/clear calls with the same input don't touch the scene
+        self._peak_marker_key: Optional[tuple] = None
+        self._block_marker_key: Optional[tuple] = None
+        
+        self._vb.sigXRangeChanged.connect(self._update_lod)
+        self._vb.sigResized.connect(self._update_lod)
+    
+    def plot_sweep(self, sweep_data: SweepData, show_command: bool = False,
+                   baseline_offset: Union[float, np.ndarray] = 0.0):
         """Plot sweep data (data is already filtered if filters were applied)
         
         Args:
             sweep_data: Sweep data to plot (may contain pre-filtered data)
             show_command: Whether to show command waveform
-            baseline_offset: Baseline correction offset
+            baseline_offset: Baseline correction offset, or a per-sample baseline
+                (smoothed on a decimated copy before it is subtracted)
         """
         self.current_time = sweep_data.time
-        
-        # Data is already filtered (stored in filtered_data_ch0/ch1), just apply baseline correction
-        self.current_data = sweep_data.data - baseline_offset
-        self.current_command = sweep_data.command
-        
-        # Clear previous plots
-        self.clear()
-        
-        # Clear block markers when replotting
-        self.clear_block_markers()
-        # Clear peak markers when replotting
-        self.clear_peak_markers()
-        
-        # Plot data with customizable color
-        self.data_plot = self.plot(sweep_data.time, self.current_data, 
-                                   pen=pg.mkPen(self.trace_color, width=1.5))
-        
-        # Enable performance optimizations after plot creation
-        # This avoids any coordinate system issues
-        if isinstance(self.data_plot, pg.PlotDataItem):
-            self.data_plot.setClipToView(True)  # Only render visible data points
+        self._t0, self._dt = self._uniform_grid(sweep_data.time)
+        
+        # Data is already filtered (stored in filtered_data_ch0/ch1), just apply baseline correction.
+        # Traces are stored as float32 (16-bit ADC data); time stays float64 for cursor precision
+        if np.ndim(baseline_offset) > 0:
+            baseline_offset = AnalysisTools.decimated_baseline(baseline_offset, sweep_data.time)
+        if (np.ndim(baseline_offset) == 0 and baseline_offset == 0
+                and getattr(sweep_data.data, 'dtype', None) == np.float32):
+            # Nothing to subtract: show the sweep's own array (only ever read here)
+            self.current_data = sweep_data.data
+        else:
+            if self._data_buf is None or self._data_buf.shape != np.shape(sweep_data.data):
+                self._data_buf = np.empty(np.shape(sweep_data.data), dtype=np.float32)
+            self.current_data = np.subtract(sweep_data.data, baseline_offset,
+                                            out=self._data_buf, dtype=np.float32)
+        self.current_command = np.asarray(sweep_data.command, dtype=np.float32)
+        
+        # Persistent items are updated in place; repaint once at the end
+        self.setUpdatesEnabled(False)
+        try:
+            # Clear block markers when replotting
+            self.clear_block_markers()
+            # Clear peak markers when replotting
+            self.clear_peak_markers()
+            
+            # Long uniform traces use the precomputed min/max levels instead of
+            # pyqtgraph's downsampler, which reruns on every repaint
+            self._lod_levels = []
+            if self._dt is not None and len(self.current_data) >= self.LOD_MIN_SAMPLES:
+                for factor in self.LOD_FACTORS:
+                    x_ds, y_ds = AnalysisTools.peak_downsample(sweep_data.time, self.current_data, factor)
+                    self._lod_levels.append((factor, x_ds, y_ds))
+            
+            if self._lod_levels:
+                self.data_plot.setDownsampling(ds=1, auto=False)
+            else:
+                self._enable_auto_downsampling(self.data_plot)
+            self._lod_factor, x_data, y_data = self._select_lod()
+            self.data_plot.setData(x_data, y_data)
+            
+            # Plot command if available and requested (dotted)
+            has_command = sweep_data.has_command
+            if has_command is None:
+                has_command = np.count_nonzero(self.current_command) > 0
+            if show_command and has_command:
+                self.command_plot.setData(sweep_data.time, self.current_command)
+                self.command_plot.setVisible(True)
+            else:
+                self.command_plot.setData([], [])
+                self.command_plot.setVisible(False)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+    
+    @staticmethod
+    def _enable_auto_downsampling(item: pg.PlotDataItem):
+        """Turn on pyqtgraph's automatic peak downsampling for a data item"""
+        try:
+            # Try new API first
+            item.setDownsampling(ds=True, auto=True, method='peak')
+        except (TypeError, AttributeError):
+            # Fall back to basic API if method parameter not supported
             try:
-                # Try new API first
-                self.data_plot.setDownsampling(ds=True, auto=True, method='peak')
+                item.setDownsampling(ds=True, auto=True)
             except (TypeError, AttributeError):
-                # Fall back to basic API if method parameter not supported
-                try:
-                    self.data_plot.setDownsampling(ds=True, auto=True)
-                except (TypeError, AttributeError):
-                    # Fall back to even simpler API
-                    self.data_plot.setDownsampling(True)
-                    if hasattr(self.data_plot, 'setAutoDownsample'):
-                        self.data_plot.setAutoDownsample(True)
-        
-        # Plot command if available and requested (dotted)
-        if show_command and sweep_data.command is not None and len(sweep_data.command) > 0:
-            if np.any(sweep_data.command != 0):
-                self.command_plot = self.plot(sweep_data.time, sweep_data.command,
-                                             pen=pg.mkPen('k', width=1, style=Qt.PenStyle.DotLine))
-                # Enable performance optimizations for command plot too
-                if isinstance(self.command_plot, pg.PlotDataItem):
-                    self.command_plot.setClipToView(True)
-                    try:
-                        # Try new API first
-                        self.command_plot.setDownsampling(ds=True, auto=True, method='peak')
-                    except (TypeError, AttributeError):
-                        # Fall back to basic API if method parameter not supported
-                        try:
-                            self.command_plot.setDownsampling(ds=True, auto=True)
-                        except (TypeError, AttributeError):
-                            # Fall back to even simpler API
-                            self.command_plot.setDownsampling(True)
-                            if hasattr(self.command_plot, 'setAutoDownsample'):
-                                self.command_plot.setAutoDownsample(True)
-        
-        # Re-add cursors if they were enabled
-        if self.cursor1_enabled:
-            self.enable_cursor1()
-        if self.cursor2_enabled:
-            self.enable_cursor2()
+                # Fall back to even simpler API
+                item.setDownsampling(True)
+                if hasattr(item, 'setAutoDownsample'):
+                    item.setAutoDownsample(True)
     
     def enable_cursor1(self):
         """Enable cursor 1"""
-        self.cursor1_enabled = True
-        if self.cursor1_line is None:
-            # Get center of current view for initial position
-            vb = self.getViewBox()
-            if vb:
-                x_range = vb.viewRange()[0]
-                initial_x = (x_range[0] + x_range[1]) / 2
-            else:
-                initial_x = 0.0
-            
-            # Create cursor line
-            self.cursor1_line = pg.InfiniteLine(angle=90, movable=True,
-                                               pen=pg.mkPen('r', width=2),
-                                               hoverPen=pg.mkPen((255, 180, 180), width=2))  # Lighter red for hover
-            self.cursor1_line.setValue(initial_x)  # Set position after creation
-            self.cursor1_line.sigPositionChanged.connect(self._on_cursor1_moved)
-            self.addItem(self.cursor1_line)
-        else:
-            # If cursor already exists, reposition to center if at 0.0
-            if abs(self.cursor1_line.value()) < 1e-10:  # Check if essentially 0
-                vb = self.getViewBox()
-                if vb:
-                    x_range = vb.viewRange()[0]
-                    initial_x = (x_range[0] + x_range[1]) / 2
-                    self.cursor1_line.setValue(initial_x)
-            self.addItem(self.cursor1_line)
+        self._enable_cursor(1)
     
     def enable_cursor2(self):
         """Enable cursor 2"""
-        self.cursor2_enabled = True
-        if self.cursor2_line is None:
+        self._enable_cursor(2)
+    
+    def _enable_cursor(self, which: int):
+        """Enable cursor 1 or 2, creating its line on first use"""
+        setattr(self, f'cursor{which}_enabled', True)
+        line = getattr(self, f'cursor{which}_line')
+        if line is None:
             # Get center of current view for initial position
-            vb = self.getViewBox()
-            if vb:
-                x_range = vb.viewRange()[0]
-                initial_x = (x_range[0] + x_range[1]) / 2
-            else:
-                initial_x = 0.0
+            x_range = self._vb.viewRange()[0]
+            initial_x = (x_range[0] + x_range[1]) / 2
             
             # Create cursor line
-            self.cursor2_line = pg.InfiniteLine(angle=90, movable=True,
-                                               pen=pg.mkPen('b', width=2),
-                                               hoverPen=pg.mkPen((180, 180, 255), width=2))  # Lighter blue for hover
-            self.cursor2_line.setValue(initial_x)  # Set position after creation
-            self.cursor2_line.sigPositionChanged.connect(self._on_cursor2_moved)
-            self.addItem(self.cursor2_line)
+            line = pg.InfiniteLine(angle=90, movable=True,
+                                   pen=self._CURSOR_PENS[which],
+                                   hoverPen=self._CURSOR_HOVER_PENS[which])
+            line.setValue(initial_x)  # Set position after creation
+            line.sigPositionChanged.connect(getattr(self, f'_on_cursor{which}_moved'))
+            setattr(self, f'cursor{which}_line', line)
         else:
             # If cursor already exists, reposition to center if at 0.0
-            if abs(self.cursor2_line.value()) < 1e-10:  # Check if essentially 0
-                vb = self.getViewBox()
-                if vb:
-                    x_range = vb.viewRange()[0]
-                    initial_x = (x_range[0] + x_range[1]) / 2
-                    self.cursor2_line.setValue(initial_x)
-            self.addItem(self.cursor2_line)
+            if abs(line.value()) < 1e-10:  # Check if essentially 0
+                x_range = self._vb.viewRange()[0]
+                line.setValue((x_range[0] + x_range[1]) / 2)
+        # Lines stay in the scene once added; disabling only hides them
+        if line not in self.getPlotItem().items:
+            self.addItem(line)
+        line.setVisible(True)
     
     def set_cursor1_position(self, x: float):
         """Set cursor 1 position (for synchronization)"""
@@ -317,13 +397,13 @@ class TracePlotWidget(PlotWidget):
         """Disable cursor 1"""
         self.cursor1_enabled = False
         if self.cursor1_line:
-            self.removeItem(self.cursor1_line)
+            self.cursor1_line.setVisible(False)
     
     def disable_cursor2(self):
         """Disable cursor 2"""
         self.cursor2_enabled = False
         if self.cursor2_line:
-            self.removeItem(self.cursor2_line)
+            self.cursor2_line.setVisible(False)
     
     def _on_cursor1_moved(self):
         """Handle cursor 1 movement"""
@@ -333,21 +413,22 @@ class TracePlotWidget(PlotWidget):
             
             # If cursors are locked, move cursor 2 maintaining distance
             if self.cursors_locked and self.cursor2_line:
-                if not hasattr(self, '_cursor_distance'):
+                if not self._cursor_distance_set:
                     # First time - calculate and store distance
                     x2 = self.cursor2_line.value()
                     self._cursor_distance = x2 - x
+                    self._cursor_distance_set = True
                 else:
                     # Move cursor 2 maintaining distance
                     new_x2 = x + self._cursor_distance
-                    # Temporarily disconnect to avoid recursive updates
+                    # Block the other cursor's signals to avoid recursive updates
+                    # (restored even if the move raises)
                     if self.cursor2_line:
-                        self.cursor2_line.blockSignals(True)
-                        self.set_cursor2_position(new_x2)
-                        self.cursor2_line.blockSignals(False)
+                        with QSignalBlocker(self.cursor2_line):
+                            self.set_cursor2_position(new_x2)
             
-            self.cursor1_set.emit(x, y)
-            self.cursor_moved.emit(x, y)
+            self._pending_cursors[1] = (x, y)
+            self._cursor_emit_timer.start()
     
     def _on_cursor2_moved(self):
         """Handle cursor 2 movement"""
@@ -357,36 +438,55 @@ class TracePlotWidget(PlotWidget):
             
             # If cursors are locked, move cursor 1 maintaining distance
             if self.cursors_locked and self.cursor1_line:
-                if not hasattr(self, '_cursor_distance'):
+                if not self._cursor_distance_set:
                     # First time - calculate and store distance
                     x1 = self.cursor1_line.value()
                     self._cursor_distance = x - x1
+                    self._cursor_distance_set = True
                 else:
                     # Move cursor 1 maintaining distance
                     new_x1 = x - self._cursor_distance
-                    # Temporarily disconnect to avoid recursive updates
+                    # Block the other cursor's signals to avoid recursive updates
+                    # (restored even if the move raises)
                     if self.cursor1_line:
-                        self.cursor1_line.blockSignals(True)
-                        self.set_cursor1_position(new_x1)
-                        self.cursor1_line.blockSignals(False)
+                        with QSignalBlocker(self.cursor1_line):
+                            self.set_cursor1_position(new_x1)
             
+            self._pending_cursors[2] = (x, y)
+            self._cursor_emit_timer.start()
+    
+    def _emit_cursor_positions(self):
+        """Emit the latest position of each cursor moved since the last frame"""
+        pending = self._pending_cursors
+        self._pending_cursors = {}
+        if 1 in pending:
+            x, y = pending[1]
+            self.cursor1_set.emit(x, y)
+            self.cursor_moved.emit(1, x, y)
+        if 2 in pending:
+            x, y = pending[2]
             self.cursor2_set.emit(x, y)
-            self.cursor_moved.emit(x, y)
+            self.cursor_moved.emit(2, x, y)
     
     def set_cursors_locked(self, locked: bool):
         """Set whether cursors are locked together"""
         self.cursors_locked = locked
         # Reset distance when unlocking
+        if not locked:
+            self._cursor_distance_set = False
     
     def set_trace_color(self, color):
         """Set the color for the trace (can be string like 'k', 'r', or RGB tuple)"""
+        if color == self.trace_color:
+            return
         self.trace_color = color
-        # Update existing plot if it exists
-        if self.data_plot is not None:
-            self.data_plot.setPen(pg.mkPen(color, width=1.5))
+        self._trace_pen = pg.mkPen(color, width=1.5)
+        self.data_plot.setPen(self._trace_pen)
     
     def set_grid_visible(self, visible: bool):
         """Show or hide grid lines"""
+        if visible == self.grid_visible:
+            return
         self.grid_visible = visible
         self.showGrid(x=visible, y=visible, alpha=0.2 if visible else 0)
     
@@ -395,103 +495,149 @@ class TracePlotWidget(PlotWidget):
         # No label updates needed anymore
         pass
     
+    @staticmethod
+    def _uniform_grid(time: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+        """Return (t0, dt) if time is uniformly sampled, else (None, None)"""
+        if time is None or len(time) < 2:
+            return None, None
+        t0 = float(time[0])
+        dt = float(time[1] - time[0])
+        if not np.isfinite(dt) or dt <= 0:
+            return None, None
+        # Endpoint check: a uniform grid lands on the last sample
+        if abs(t0 + dt * (len(time) - 1) - float(time[-1])) > dt * 1e-3:
+            return None, None
+        return t0, dt
+    
     def _get_y_at_x(self, x: float) -> float:
         """Get y value at x position by interpolation"""
+        return float(self._get_y_at_xs(np.array([x], dtype=np.float64))[0])
+    
+    def _get_y_at_xs(self, xs: np.ndarray) -> np.ndarray:
+        """Get the y values of the samples nearest to each x position"""
+        xs = np.asarray(xs, dtype=np.float64)
         if self.current_time is None or self.current_data is None:
-            return 0.0
+            return np.zeros(xs.shape)
+        
+        n = min(len(self.current_time), len(self.current_data))
+        if n == 0:
+            return np.zeros(xs.shape)
+        
+        # Find closest indices: direct arithmetic on a uniform grid,
+        # binary search otherwise (ties go to the lower sample)
+        if self._dt is not None:
+            idx = np.floor((xs - self._t0) / self._dt + 0.5).astype(np.intp)
+        else:
+            time = self.current_time
+            idx = np.searchsorted(time, xs)
+            below = np.clip(idx - 1, 0, len(time) - 1)
+            above = np.clip(idx, 0, len(time) - 1)
+            use_below = (idx > 0) & ((idx >= len(time)) | (xs - time[below] <= time[above] - xs))
+            idx = np.where(use_below, below, idx)
+        np.clip(idx, 0, n - 1, out=idx)
+        return self.current_data[idx].astype(np.float64)
+    
+    def _select_lod(self) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Coarsest downsampled level that still has a block per pixel, or the full trace"""
+        factor, x_data, y_data = 1, self.current_time, self.current_data
+        vb = self._vb
+        pixel_width = vb.width()
+        if not self._lod_levels or pixel_width <= 0:
+            return factor, x_data, y_data
         
-        # Find closest index
-        idx = np.argmin(np.abs(self.current_time - x))
-        if idx < len(self.current_data):
-            return float(self.current_data[idx])
-        return 0.0
+        x_range = vb.viewRange()[0]
+        samples_per_pixel = (x_range[1] - x_range[0]) / self._dt / pixel_width
+        for level in self._lod_levels:
+            if level[0] <= samples_per_pixel:
+                factor, x_data, y_data = level
+        return factor, x_data, y_data
+    
+    def _update_lod(self, *args):
+        """Swap the displayed level when the visible x-range or plot width changes"""
+        if not self._lod_levels:
+            return
+        factor, x_data, y_data = self._select_lod()
+        if factor != self._lod_factor:
+            self._lod_factor = factor
+            self.data_plot.setData(x_data, y_data)
     
     def get_cursor_positions(self) -> Tuple[float, float, float, float]:
         """Get cursor positions (x1, y1, x2, y2)"""
         x1 = self.cursor1_line.value() if self.cursor1_line else 0.0
-        y1 = self._get_y_at_x(x1)
         x2 = self.cursor2_line.value() if self.cursor2_line else 0.0
-        y2 = self._get_y_at_x(x2)
-        return x1, y1, x2, y2
+        y1, y2 = self._get_y_at_xs(np.array([x1, x2], dtype=np.float64))
+        return x1, float(y1), x2, float(y2)
     
     def mark_peaks(self, peaks: List[Peak]):
         """Mark peaks on the plot"""
-        # Clear existing peak markers first
-        self.clear_peak_markers()
-        
-        for peak in peaks:
-            if self.current_time is not None:
-                time = self.current_time[peak.index]
-                color = 'g' if peak.is_max else 'r'
-                scatter = pg.ScatterPlotItem([time], [peak.value], 
-                                            symbol='o', size=10, 
-                                            pen=pg.mkPen(color, width=2),
-                                            brush=pg.mkBrush(color))
-                self.addItem(scatter)
-                
-                # Store references for clearing
-                if not hasattr(self, '_peak_markers'):
-                    self._peak_markers = []
-                self._peak_markers.append(scatter)
+        if self.current_time is None or not peaks:
+            self.clear_peak_markers()
+            return
+        
+        key = tuple((peak.index, peak.value, peak.is_max) for peak in peaks)
+        if key == self._peak_marker_key:
+            return
+        self._peak_marker_key = key
+        
+        count = len(peaks)
+        indices = np.fromiter((peak.index for peak in peaks), dtype=np.intp, count=count)
+        values = np.fromiter((peak.value for peak in peaks), dtype=np.float64, count=count)
+        is_max = np.fromiter((peak.is_max for peak in peaks), dtype=np.intp, count=count)
+        self._peak_scatter.setData(self.current_time[indices], values,
+                                   pen=self._peak_pens[is_max],
+                                   brush=self._peak_brushes[is_max])
     
     def clear_peak_markers(self):
         """Clear all peak markers from the plot"""
-        if hasattr(self, '_peak_markers'):
-            for marker in self._peak_markers:
-                try:
-                    self.removeItem(marker)
-                except:
-                    pass
-            self._peak_markers = []
+        if self._peak_marker_key is None:
+            return
+        self._peak_marker_key = None
+        self._peak_scatter.setData([], [])
     
     def mark_blocks(self, blocks: List[Dict]):
         """Mark blocks on the plot with colored regions"""
-        # Clear existing block markers
-        self.clear_block_markers()
-        
-        for block in blocks:
-            start_time = block.get('start_time')
-            end_time = block.get('end_time')
-            avg_amplitude = block.get('average_amplitude', 0)
-            
-            if start_time is None or end_time is None:
-                continue
-            
-            # Create a region highlight for the block
-            # Use a semi-transparent rectangle
-            region = LinearRegionItem([start_time, end_time], 
-                                     movable=False,
-                                     brush=pg.mkBrush((255, 200, 0, 100)),  # Orange/yellow with transparency
-                                     pen=pg.mkPen((255, 150, 0, 200), width=2))
-            self.addItem(region)
-            
-            # Also mark the average amplitude point
-            mid_time = (start_time + end_time) / 2
-            scatter = pg.ScatterPlotItem([mid_time], [avg_amplitude],
-                                        symbol='s', size=8,
-                                        pen=pg.mkPen('orange', width=2),
-                                        brush=pg.mkBrush('orange'))
-            self.addItem(scatter)
-            
-            # Store references for clearing
-            if not hasattr(self, '_block_markers'):
-                self._block_markers = []
-            self._block_markers.append(region)
-            self._block_markers.append(scatter)
+        spans = [(block.get('start_time'), block.get('end_time'), block.get('average_amplitude', 0))
+                 for block in blocks]
+        spans = [span for span in spans if span[0] is not None and span[1] is not None]
+        key = tuple(spans)
+        if key == self._block_marker_key:
+            return
+        self._block_marker_key = key
+        
+        # Reuse region items from the pool, creating more only when needed
+        for i, (start_time, end_time, _) in enumerate(spans):
+            if i < len(self._block_regions):
+                region = self._block_regions[i]
+                region.setRegion([start_time, end_time])
+                region.setVisible(True)
+            else:
+                # Semi-transparent highlight for the block
+                region = LinearRegionItem([start_time, end_time], 
+                                         movable=False,
+                                         brush=pg.mkBrush((255, 200, 0, 100)),  # Orange/yellow with transparency
+                                         pen=pg.mkPen((255, 150, 0, 200), width=2))
+                self.addItem(region)
+                self._block_regions.append(region)
+        for region in self._block_regions[len(spans):]:
+            region.setVisible(False)
+        
+        # Also mark the average amplitude of each block at its midpoint
+        mid_times = [(start_time + end_time) / 2 for start_time, end_time, _ in spans]
+        amplitudes = [amplitude for _, _, amplitude in spans]
+        self._block_scatter.setData(mid_times, amplitudes)
     
     def clear_block_markers(self):
         """Clear all block markers from the plot"""
-        if hasattr(self, '_block_markers'):
-            for marker in self._block_markers:
-                try:
-                    self.removeItem(marker)
-                except:
-                    pass
-            self._block_markers = []
+        if self._block_marker_key is None:
+            return
+        self._block_marker_key = None
+        for region in self._block_regions:
+            region.setVisible(False)
+        self._block_scatter.setData([], [])
     
     def zoom_x(self, factor: float):
         """Zoom x-axis by factor"""
-        vb = self.getViewBox()
+        vb = self._vb
         x_range = vb.viewRange()[0]
         center = (x_range[0] + x_range[1]) / 2
         width = x_range[1] - x_range[0]
@@ -500,7 +646,7 @@ class TracePlotWidget(PlotWidget):
     
     def zoom_y(self, factor: float):
         """Zoom y-axis by factor"""
-        vb = self.getViewBox()
+        vb = self._vb
         y_range = vb.viewRange()[1]
         center = (y_range[0] + y_range[1]) / 2
         height = y_range[1] - y_range[0]
@@ -509,7 +655,7 @@ class TracePlotWidget(PlotWidget):
     
     def pan_x(self, direction: str):
         """Pan x-axis"""
-        vb = self.getViewBox()
+        vb = self._vb
         x_range = vb.viewRange()[0]
         width = x_range[1] - x_range[0]
         shift = width * 0.1
@@ -520,7 +666,7 @@ class TracePlotWidget(PlotWidget):
     
     def pan_y(self, direction: str):
         """Pan y-axis"""
-        vb = self.getViewBox()
+        vb = self._vb
         y_range = vb.viewRange()[1]
         height = y_range[1] - y_range[0]
         shift = height * 0.1
@@ -567,130 +713,81 @@ class DualChannelPlotWidget(QWidget):
         self.plot0.cursor_moved.connect(self._sync_cursors)
         self.plot1.cursor_moved.connect(self._sync_cursors)
     
-    def _sync_cursors(self, x: float, y: float):
+    def _sync_cursors(self, cursor_id: int, x: float, y: float):
         """Synchronize cursor positions between plots"""
-        # Get which cursor moved
-        if self.plot0.cursor1_enabled and self.plot0.cursor1_line:
-            if abs(self.plot0.cursor1_line.value() - x) < 0.0001:
-                # Cursor 1 moved on plot0, sync to plot1
-                self.plot1.set_cursor1_position(x)
-        if self.plot0.cursor2_enabled and self.plot0.cursor2_line:
-            if abs(self.plot0.cursor2_line.value() - x) < 0.0001:
-                # Cursor 2 moved on plot0, sync to plot1
-                self.plot1.set_cursor2_position(x)
-        if self.plot1.cursor1_enabled and self.plot1.cursor1_line:
-            if abs(self.plot1.cursor1_line.value() - x) < 0.0001:
-                # Cursor 1 moved on plot1, sync to plot0
-                self.plot0.set_cursor1_position(x)
-        if self.plot1.cursor2_enabled and self.plot1.cursor2_line:
-            if abs(self.plot1.cursor2_line.value() - x) < 0.0001:
-                # Cursor 2 moved on plot1, sync to plot0
-                self.plot0.set_cursor2_position(x)
+        # The emitting plot is the source, the other one follows
+        target = self.plot1 if self.sender() is self.plot0 else self.plot0
+        if cursor_id == 1:
+            target.set_cursor1_position(x)
+        else:
+            target.set_cursor2_position(x)
     
     def _create_plot_container(self, plot: TracePlotWidget, index: int) -> QWidget:
         """Create a container widget with plot and axis arrows"""
         container = QWidget()
-        container_layout = QVBoxLayout(container)
-        container_layout.setContentsMargins(20, 5, 5, 5)
-        container_layout.setSpacing(0)
-        
-        # Top row: y-axis up arrow, plot area, y-axis down arrow
-        top_row = QHBoxLayout()
-        top_row.setContentsMargins(0, 0, 0, 0)
-        top_row.setSpacing(0)
-        
-        # Left side: y-axis controls (zoom buttons together, pan centered)
-        y_axis_container = QVBoxLayout()
-        y_axis_container.setContentsMargins(0, 0, 5, 0)
-        y_axis_container.setSpacing(0)
-        
-        # Top: zoom buttons together (side by side)
-        zoom_buttons_container = QHBoxLayout()
-        zoom_buttons_container.setContentsMargins(0, 0, 0, 0)
-        zoom_buttons_container.setSpacing(3)
+        grid = QGridLayout(container)
+        grid.setContentsMargins(20, 5, 5, 5)
+        grid.setSpacing(3)
         
+        # Left side, top: y-axis zoom buttons side by side
         zoom_in_y = ZoomButton('+')
         zoom_in_y.clicked.connect(lambda: plot.zoom_y(1.2))  # Zoom in (show less)
-        zoom_buttons_container.addWidget(zoom_in_y, 0, Qt.AlignCenter)
+        grid.addWidget(zoom_in_y, 0, 0, Qt.AlignLeft | Qt.AlignTop)
         
         zoom_out_y = ZoomButton('-')
         zoom_out_y.clicked.connect(lambda: plot.zoom_y(1/1.2))  # Zoom out (show more)
-        zoom_buttons_container.addWidget(zoom_out_y, 0, Qt.AlignCenter)
+        grid.addWidget(zoom_out_y, 0, 1, Qt.AlignLeft | Qt.AlignTop)
+        # 2 px wider than the button so the plot sits 5 px from it
+        grid.setColumnMinimumWidth(1, 20)
         
-        y_axis_container.addLayout(zoom_buttons_container, 0)
-        y_axis_container.addStretch()
-        
-        # Middle: pan arrows centered vertically (close together)
-        pan_container = QVBoxLayout()
-        pan_container.setContentsMargins(0, 0, 0, 0)
-        pan_container.setSpacing(3)
-        
-        # Pan up arrow
+        # Left side, middle: pan arrows centered in the space below the zoom buttons
+        # (rows 1 and 2 share the height, the arrows meet at the boundary)
         pan_up = ZoomArrowButton('up')
         pan_up.clicked.connect(lambda: plot.pan_y('up'))
-        pan_container.addWidget(pan_up, 0, Qt.AlignCenter)
+        grid.addWidget(pan_up, 1, 0, 1, 2, Qt.AlignHCenter | Qt.AlignBottom)
         
-        # Pan down arrow
         pan_down = ZoomArrowButton('down')
         pan_down.clicked.connect(lambda: plot.pan_y('down'))
-        pan_container.addWidget(pan_down, 0, Qt.AlignCenter)
-        
-        y_axis_container.addLayout(pan_container, 0)
-        y_axis_container.addStretch()
-        
-        top_row.addLayout(y_axis_container, 0)
+        grid.addWidget(pan_down, 2, 0, 1, 2, Qt.AlignHCenter | Qt.AlignTop)
+        grid.setRowStretch(1, 1)
+        grid.setRowStretch(2, 1)
         
         # Plot area
-        plot_container = QVBoxLayout()
-        plot_container.setContentsMargins(0, 0, 0, 0)
-        plot_container.setSpacing(0)
-        plot_container.addWidget(plot, 1)
-        
-        # Bottom row: x-axis arrows (only for bottom plot)
-        bottom_arrows = QHBoxLayout()
-        bottom_arrows.setContentsMargins(20, 0, 0, 0)
-        bottom_arrows.setSpacing(0)
-        bottom_arrows.addStretch()
-        
-        if index == 1:  # Only show on bottom plot
-            # Pan left arrow
+        grid.addWidget(plot, 0, 2, 3, 1)
+        grid.setColumnStretch(2, 1)
+        
+        # Bottom plot only: x-axis pan arrows under the plot and zoom buttons at the right
+        if index == 1:
+            bottom_arrows = QHBoxLayout()
+            bottom_arrows.setContentsMargins(20, 0, 0, 0)
+            bottom_arrows.setSpacing(10)
+            bottom_arrows.addStretch()
+            
             left_arrow = ZoomArrowButton('left')
             left_arrow.clicked.connect(lambda: self._pan_x_all('left'))
             bottom_arrows.addWidget(left_arrow)
             
-            bottom_arrows.addSpacing(10)
-            
-            # Pan right arrow
             right_arrow = ZoomArrowButton('right')
             right_arrow.clicked.connect(lambda: self._pan_x_all('right'))
             bottom_arrows.addWidget(right_arrow)
-        
-        bottom_arrows.addStretch()
-        
-        plot_container.addLayout(bottom_arrows)
-        top_row.addLayout(plot_container, 1)
-        
-        container_layout.addLayout(top_row, 1)
-        
-        # Add zoom buttons on right side of x-axis (only for bottom plot)
-        if index == 1:
+            
+            bottom_arrows.addStretch()
+            grid.addLayout(bottom_arrows, 3, 2)
+            
             x_axis_row = QHBoxLayout()
-            x_axis_row.setContentsMargins(20, 0, 0, 0)
-            x_axis_row.setSpacing(0)
+            x_axis_row.setContentsMargins(0, 0, 20, 0)
+            x_axis_row.setSpacing(5)
             x_axis_row.addStretch()
             
             zoom_in_x = ZoomButton('+')
             zoom_in_x.clicked.connect(lambda: self._zoom_x_all(1.2))  # Zoom in (show less)
             x_axis_row.addWidget(zoom_in_x)
             
-            x_axis_row.addSpacing(5)
-            
             zoom_out_x = ZoomButton('-')
             zoom_out_x.clicked.connect(lambda: self._zoom_x_all(1/1.2))  # Zoom out (show more)
             x_axis_row.addWidget(zoom_out_x)
             
-            x_axis_row.addSpacing(20)
-            container_layout.addLayout(x_axis_row, 0)
+            grid.addLayout(x_axis_row, 4, 0, 1, 3)
         
         return container
     
@@ -792,6 +889,7 @@ class BlockDetectionDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Block Detection")
         self.setModal(True)
+        self.cursor1_y = cursor1_y
         
         layout = QFormLayout()
         
@@ -833,9 +931,7 @@ class BlockDetectionDialog(QDialog):
         
         # Update baseline spin when checkbox changes
         if cursor1_y is not None:
-            self.use_cursor1_check.toggled.connect(
-                lambda checked: self.baseline_threshold_spin.setValue(cursor1_y) if checked else None
-            )
+            self.use_cursor1_check.toggled.connect(self._on_use_cursor1_toggled)
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
@@ -844,41 +940,191 @@ class BlockDetectionDialog(QDialog):
         
         self.setLayout(layout)
     
-    def get_baseline_threshold(self):
-        """Get baseline threshold (None if auto)"""
-        if self.use_cursor1_check.isChecked():
-            return self.baseline_threshold_spin.value()
-        val = self.baseline_threshold_spin.value()
-        return None if val == 0.0 else val
+    def _on_use_cursor1_toggled(self, checked: bool):
+        """Reload the cursor 1 value into the baseline field when the option is re-checked"""
+        if checked:
+            self.baseline_threshold_spin.setValue(self.cursor1_y)
+    
+    def get_params(self) -> BlockDetectionParams:
+        """Get the detection parameters (baseline threshold is None if auto)"""
+        baseline_threshold = self.baseline_threshold_spin.value()
+        if not self.use_cursor1_check.isChecked() and baseline_threshold == 0.0:
+            baseline_threshold = None
+        return BlockDetectionParams(
+            baseline_threshold=baseline_threshold,
+            block_threshold_factor=self.block_threshold_factor_spin.value(),
+            min_block_duration=self.min_duration_spin.value()
+        )
+
+
+def format_cell_value(value: float, fmt: str) -> str:
+    """Format a numeric cell, memoised since tables repeat many values (zeros, baselines)"""
+    # Keyed on the bit pattern: 0.0 and -0.0 compare (and hash) equal but format differently
+    return _format_cell_bits(struct.pack('<d', value), fmt)
+
+
+@lru_cache(maxsize=8192)
+def _format_cell_bits(bits: bytes, fmt: str) -> str:
+    return format(struct.unpack('<d', bits)[0], fmt)
+
+
+def write_csv(file_path: str, data: np.ndarray, header: str,
+              fmt: Union[str, Sequence[str]] = '%.18e', chunk_rows: int = 65536):
+    """
+    Write a 2-D array as CSV with a header line (same output as np.savetxt)
+    
+    fmt is one format for every column or one per column. Rows are formatted
+    a chunk at a time with a single %-operation instead of np.savetxt's
+    per-row Python loop.
+    """
+    column_fmts = [fmt] * data.shape[1] if isinstance(fmt, str) else list(fmt)
+    row_fmt = ','.join(column_fmts) + '\n'
+    with open(file_path, 'w', newline='') as f:
+        f.write(header + '\n')
+        for start in range(0, data.shape[0], chunk_rows):
+            chunk = data[start:start + chunk_rows]
+            f.write((row_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Read-only table model that keeps raw row values and formats them on display
+    
+    Rows are exposed to the view in batches (canFetchMore/fetchMore), so a
+    table with thousands of records only lays out what has been scrolled to.
+    """
+    FETCH_BATCH = 200
+    
+    def __init__(self, headers: Sequence[str], formats: Sequence[Optional[str]], parent=None):
+        """
+        Args:
+            headers: Column header labels (plain text, no tabs)
+            formats: Per-column format spec (e.g. '.6f'), or None to display str(value)
+        """
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._formats = list(formats)
+        self._header_tsv = "\t".join(self._headers) + "\n"
+        self._rows: List[tuple] = []
+        self._loaded = 0  # rows currently exposed to views
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
     
-    def get_block_threshold_factor(self):
-        """Get block threshold factor"""
-        return self.block_threshold_factor_spin.value()
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._rows)
     
-    def get_min_duration(self):
-        """Get minimum block duration"""
-        return self.min_duration_spin.value()
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.FETCH_BATCH, len(self._rows) - self._loaded)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+    
+    def record_count(self) -> int:
+        """Number of stored rows, including those not yet fetched by the view"""
+        return len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.display_text(index.row(), index.column())
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+    
+    def display_text(self, row: int, column: int) -> str:
+        """Formatted text of a cell (empty for missing values)"""
+        value = self._rows[row][column]
+        if value is None:
+            return ""
+        fmt = self._formats[column]
+        return format_cell_value(value, fmt) if fmt else str(value)
+    
+    def rows_to_tsv(self, rows) -> str:
+        """Tab-separated text of the given rows, preceded by the header line"""
+        columns = range(len(self._headers))
+        display_text = self.display_text
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter='\t', lineterminator='\n')
+        buffer.write(self._header_tsv)
+        writer.writerows([display_text(row, col) for col in columns] for row in rows)
+        # No line terminator after the last row
+        return buffer.getvalue()[:-1]
+    
+    def append_rows(self, rows: List[tuple]):
+        """Append rows of raw values (the first batch is shown if the view was up to date)"""
+        if not rows:
+            return
+        caught_up = self._loaded == len(self._rows)
+        self._rows.extend(rows)
+        if caught_up:
+            self.fetchMore()
+    
+    def clear(self):
+        """Remove all rows"""
+        self.beginResetModel()
+        self._rows = []
+        self._loaded = 0
+        self.endResetModel()
+    
+    def sample_text(self, column: int) -> str:
+        """Representative cell text for sizing a column without scanning its rows"""
+        fmt = self._formats[column]
+        return format(-1000.0, fmt) if fmt else "00000"
 
 
-class BlocksTableDialog(QDialog):
-    """Dialog for displaying detected blocks in a table"""
+def preset_column_widths(table: QTableView):
+    """
+    Size each column once from its header and a sample value
+    
+    Columns stay user-resizable (double-clicking a header divider fits it to
+    its contents), so rows can be added without re-measuring every cell.
+    """
+    model = table.model()
+    header = table.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.Interactive)
+    header_metrics = header.fontMetrics()
+    cell_metrics = table.fontMetrics()
+    for col in range(model.columnCount()):
+        width = max(header_metrics.horizontalAdvance(model.headerData(col, Qt.Horizontal)),
+                    cell_metrics.horizontalAdvance(model.sample_text(col)))
+        table.setColumnWidth(col, width + 16)
+
+
+class RecordTableDialog(QDialog):
+    """
+    Non-modal dialog showing a RecordTableModel with copy/clear buttons
+    
+    Subclasses declare their columns as class attributes, so the header and
+    format lists are built once per class rather than per dialog.
+    """
+    TITLE = ""
+    HEADERS: Tuple[str, ...] = ()
+    FORMATS: Tuple[Optional[str], ...] = ()  # per-column format spec, None for str()
+    MIN_SIZE = (600, 400)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Blocks Table")
+        self.setWindowTitle(self.TITLE)
         self.setModal(False)
-        self.setMinimumSize(800, 400)
+        self.setMinimumSize(*self.MIN_SIZE)
         
         layout = QVBoxLayout()
         
-        # Table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "Block", "Sweep", "Start Time (s)", "End Time (s)", "Duration (s)",
-            "Average Amplitude", "Baseline Amplitude", "Block Depth"
-        ])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Table view (values are formatted only when a cell is drawn)
+        self.model = RecordTableModel(self.HEADERS, self.FORMATS, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        preset_column_widths(self.table)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.table)
         
         # Buttons
@@ -908,68 +1154,75 @@ class BlocksTableDialog(QDialog):
         # Clipboard
         self.app = QApplication.instance()
     
-    def add_blocks(self, blocks: List[Dict]):
-        """Add blocks to the table"""
-        if not blocks:
-            return
-        
-        for i, block in enumerate(blocks):
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            block_num = row + 1
-            sweep_num = block.get('sweep_number', '')
-            
-            self.table.setItem(row, 0, QTableWidgetItem(str(block_num)))
-            self.table.setItem(row, 1, QTableWidgetItem(str(sweep_num)))
-            self.table.setItem(row, 2, QTableWidgetItem(f"{block.get('start_time', 0):.6f}"))
-            self.table.setItem(row, 3, QTableWidgetItem(f"{block.get('end_time', 0):.6f}"))
-            self.table.setItem(row, 4, QTableWidgetItem(f"{block.get('duration', 0):.6f}"))
-            self.table.setItem(row, 5, QTableWidgetItem(f"{block.get('average_amplitude', 0):.6f}"))
-            self.table.setItem(row, 6, QTableWidgetItem(f"{block.get('baseline_amplitude', 0):.6f}"))
-            self.table.setItem(row, 7, QTableWidgetItem(f"{block.get('block_depth', 0):.6f}"))
-        
-        # Resize columns to content
-        self.table.resizeColumnsToContents()
+    def append_rows(self, rows: List[tuple]):
+        """Append a batch of rows with one insert notification and a single repaint"""
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.model.append_rows(rows)
+        finally:
+            self.table.setUpdatesEnabled(True)
     
     def copy_selected(self):
         """Copy selected rows to clipboard"""
-        selection = self.table.selectedIndexes()
-        if not selection:
+        # Walk the selection ranges rather than one index per selected cell
+        selection = self.table.selectionModel().selection()
+        rows = sorted({row for sel_range in selection
+                       for row in range(sel_range.top(), sel_range.bottom() + 1)})
+        if not rows:
             return
         
-        # Get unique rows
-        rows = sorted(set(index.row() for index in selection))
-        
-        lines = []
-        # Header
-        headers = []
-        for col in range(self.table.columnCount()):
-            headers.append(self.table.horizontalHeaderItem(col).text())
-        lines.append("\t".join(headers))
-        
-        # Data rows
-        for row in rows:
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                row_data.append(item.text() if item else "")
-            lines.append("\t".join(row_data))
-        
-        self.app.clipboard().setText("\n".join(lines))
+        self.app.clipboard().setText(self.model.rows_to_tsv(rows))
     
     def copy_all(self):
         """Copy all rows to clipboard"""
-        if self.table.rowCount() == 0:
+        if self.model.record_count() == 0:
             return
         
-        # Select all
-        self.table.selectAll()
-        self.copy_selected()
+        self.app.clipboard().setText(self.model.rows_to_tsv(range(self.model.record_count())))
     
     def clear_all(self):
-        """Clear all blocks"""
-        self.table.setRowCount(0)
+        """Clear all rows"""
+        self.model.clear()
+
+
+class BlocksTableDialog(RecordTableDialog):
+    """Dialog for displaying detected blocks in a table"""
+    TITLE = "Blocks Table"
+    HEADERS = ("Block", "Sweep", "Start Time (s)", "End Time (s)", "Duration (s)",
+               "Average Amplitude", "Baseline Amplitude", "Block Depth")
+    FORMATS = (None, None) + ('.6f',) * 6
+    MIN_SIZE = (800, 400)
+    
+    def add_blocks(self, blocks: Union[BlockEvents, List[Dict]]):
+        """Add blocks to the table (BlockEvents arrays or per-block dictionaries)"""
+        if len(blocks) == 0:
+            return
+        
+        first = self.model.record_count()
+        if isinstance(blocks, BlockEvents):
+            # Read each column once as a whole array instead of one dict lookup per cell
+            sweeps = (blocks.sweep_number.tolist() if blocks.sweep_number is not None
+                      else [''] * len(blocks))
+            self.append_rows(list(zip(
+                range(first + 1, first + len(blocks) + 1), sweeps,
+                blocks.start_time.tolist(), blocks.end_time.tolist(), blocks.duration.tolist(),
+                blocks.average_amplitude.tolist(), blocks.baseline_amplitude.tolist(),
+                blocks.block_depth.tolist())))
+            return
+        
+        rows = [
+            (first + i + 1,
+             block.get('sweep_number', ''),
+             block.get('start_time', 0),
+             block.get('end_time', 0),
+             block.get('duration', 0),
+             block.get('average_amplitude', 0),
+             block.get('baseline_amplitude', 0),
+             block.get('block_depth', 0))
+            for i, block in enumerate(blocks)
+        ]
+        
+        self.append_rows(rows)
 
 
 class PeakDetectionDialog(QDialog):
@@ -1010,347 +1263,80 @@ class PeakDetectionDialog(QDialog):
         self.setLayout(layout)
 
 
-class MeasurementsTableDialog(QDialog):
+class MeasurementsTableDialog(RecordTableDialog):
     """Dialog for displaying measurements in a table"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Measurements Table")
-        self.setModal(False)
-        self.setMinimumSize(600, 400)
-        
-        layout = QVBoxLayout()
-        
-        # Table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(10)
-        self.table.setHorizontalHeaderLabels([
-            "Measurement", "X1 (s)", "Y1 Ch0", "Y1 Ch1", "X2 (s)", "Y2 Ch0", "Y2 Ch1", "ΔX (s)", "ΔY Ch0", "ΔY Ch1"
-        ])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        layout.addWidget(self.table)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        copy_btn = QPushButton("Copy Selected")
-        copy_btn.clicked.connect(self.copy_selected)
-        button_layout.addWidget(copy_btn)
-        
-        copy_all_btn = QPushButton("Copy All")
-        copy_all_btn.clicked.connect(self.copy_all)
-        button_layout.addWidget(copy_all_btn)
-        
-        clear_btn = QPushButton("Clear")
-        clear_btn.clicked.connect(self.clear_all)
-        button_layout.addWidget(clear_btn)
-        
-        button_layout.addStretch()
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(self.accept)
-        button_layout.addWidget(close_btn)
-        
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-        
-        # Clipboard
-        self.app = QApplication.instance()
+    TITLE = "Measurements Table"
+    HEADERS = ("Measurement", "X1 (s)", "Y1 Ch0", "Y1 Ch1", "X2 (s)", "Y2 Ch0", "Y2 Ch1",
+               "ΔX (s)", "ΔY Ch0", "ΔY Ch1")
+    FORMATS = (None,) + ('.6f',) * 9
     
     def add_measurement(self, measurement_ch0: Measurement, measurement_ch1: Optional[Measurement] = None, measurement_num: int = None):
         """Add a measurement to the table (both channels)"""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        
         if measurement_num is None:
-            measurement_num = row + 1
+            measurement_num = self.model.record_count() + 1
         
         # Use channel 0 measurement for X positions (they're the same)
-        self.table.setItem(row, 0, QTableWidgetItem(str(measurement_num)))
-        self.table.setItem(row, 1, QTableWidgetItem(f"{measurement_ch0.x1:.6f}"))
-        self.table.setItem(row, 2, QTableWidgetItem(f"{measurement_ch0.y1:.6f}"))  # Ch0 Y1
-        self.table.setItem(row, 3, QTableWidgetItem(f"{measurement_ch1.y1:.6f}" if measurement_ch1 else ""))  # Ch1 Y1
-        self.table.setItem(row, 4, QTableWidgetItem(f"{measurement_ch0.x2:.6f}"))
-        self.table.setItem(row, 5, QTableWidgetItem(f"{measurement_ch0.y2:.6f}"))  # Ch0 Y2
-        self.table.setItem(row, 6, QTableWidgetItem(f"{measurement_ch1.y2:.6f}" if measurement_ch1 else ""))  # Ch1 Y2
-        self.table.setItem(row, 7, QTableWidgetItem(f"{measurement_ch0.delta_x:.6f}"))
-        self.table.setItem(row, 8, QTableWidgetItem(f"{measurement_ch0.delta_y:.6f}"))  # Ch0 ΔY
-        self.table.setItem(row, 9, QTableWidgetItem(f"{measurement_ch1.delta_y:.6f}" if measurement_ch1 else ""))  # Ch1 ΔY
-        
-        # Resize columns to content
-        self.table.resizeColumnsToContents()
-    
-    def copy_selected(self):
-        """Copy selected rows to clipboard"""
-        selection = self.table.selectedIndexes()
-        if not selection:
-            return
-        
-        # Get unique rows
-        rows = sorted(set(index.row() for index in selection))
-        
-        lines = []
-        # Header
-        headers = []
-        for col in range(self.table.columnCount()):
-            headers.append(self.table.horizontalHeaderItem(col).text())
-        lines.append("\t".join(headers))
-        
-        # Data rows
-        for row in rows:
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                row_data.append(item.text() if item else "")
-            lines.append("\t".join(row_data))
-        
-        self.app.clipboard().setText("\n".join(lines))
-    
-    def copy_all(self):
-        """Copy all rows to clipboard"""
-        if self.table.rowCount() == 0:
-            return
-        
-        # Select all
-        self.table.selectAll()
-        self.copy_selected()
-    
-    def clear_all(self):
-        """Clear all measurements"""
-        self.table.setRowCount(0)
+        self.model.append_rows([(
+            measurement_num,
+            measurement_ch0.x1,
+            measurement_ch0.y1,  # Ch0 Y1
+            measurement_ch1.y1 if measurement_ch1 else None,  # Ch1 Y1
+            measurement_ch0.x2,
+            measurement_ch0.y2,  # Ch0 Y2
+            measurement_ch1.y2 if measurement_ch1 else None,  # Ch1 Y2
+            measurement_ch0.delta_x,
+            measurement_ch0.delta_y,  # Ch0 ΔY
+            measurement_ch1.delta_y if measurement_ch1 else None  # Ch1 ΔY
+        )])
+
 
+# Statistics shown per channel, in column order
+STATISTICS_KEYS = ('mean', 'std', 'min', 'max', 'median', 'q25', 'q75', 'range', 'variance')
 
-class StatisticsTableDialog(QDialog):
+
+class StatisticsTableDialog(RecordTableDialog):
     """Dialog for displaying statistics in a table"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Statistics Table")
-        self.setModal(False)
-        self.setMinimumSize(600, 400)
-        
-        layout = QVBoxLayout()
-        
-        # Table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(19)  # Sweep + 9 stats per channel (2 channels)
-        self.table.setHorizontalHeaderLabels([
-            "Sweep", 
-            "Mean Ch0", "Std Ch0", "Min Ch0", "Max Ch0", "Median Ch0", "Q25 Ch0", "Q75 Ch0", "Range Ch0", "Variance Ch0",
-            "Mean Ch1", "Std Ch1", "Min Ch1", "Max Ch1", "Median Ch1", "Q25 Ch1", "Q75 Ch1", "Range Ch1", "Variance Ch1"
-        ])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        layout.addWidget(self.table)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        copy_btn = QPushButton("Copy Selected")
-        copy_btn.clicked.connect(self.copy_selected)
-        button_layout.addWidget(copy_btn)
-        
-        copy_all_btn = QPushButton("Copy All")
-        copy_all_btn.clicked.connect(self.copy_all)
-        button_layout.addWidget(copy_all_btn)
-        
-        clear_btn = QPushButton("Clear")
-        clear_btn.clicked.connect(self.clear_all)
-        button_layout.addWidget(clear_btn)
-        
-        button_layout.addStretch()
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(self.accept)
-        button_layout.addWidget(close_btn)
-        
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-        
-        # Clipboard
-        self.app = QApplication.instance()
+    TITLE = "Statistics Table"
+    # Sweep + 9 stats per channel (2 channels)
+    HEADERS = (
+        "Sweep",
+        "Mean Ch0", "Std Ch0", "Min Ch0", "Max Ch0", "Median Ch0", "Q25 Ch0", "Q75 Ch0", "Range Ch0", "Variance Ch0",
+        "Mean Ch1", "Std Ch1", "Min Ch1", "Max Ch1", "Median Ch1", "Q25 Ch1", "Q75 Ch1", "Range Ch1", "Variance Ch1"
+    )
+    FORMATS = (None,) + ('.6f',) * 18
     
     def add_statistics(self, stats_ch0: dict, stats_ch1: Optional[dict] = None, sweep_num: int = None):
         """Add statistics to the table (both channels)"""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        
         if sweep_num is None:
-            sweep_num = row + 1
-        
-        # Set sweep number
-        self.table.setItem(row, 0, QTableWidgetItem(str(sweep_num)))
-        
-        # Helper function to add stats values
-        def add_stats(stats: dict, start_col: int):
-            self.table.setItem(row, start_col + 0, QTableWidgetItem(f"{stats.get('mean', 0):.6f}"))
-            self.table.setItem(row, start_col + 1, QTableWidgetItem(f"{stats.get('std', 0):.6f}"))
-            self.table.setItem(row, start_col + 2, QTableWidgetItem(f"{stats.get('min', 0):.6f}"))
-            self.table.setItem(row, start_col + 3, QTableWidgetItem(f"{stats.get('max', 0):.6f}"))
-            self.table.setItem(row, start_col + 4, QTableWidgetItem(f"{stats.get('median', 0):.6f}"))
-            self.table.setItem(row, start_col + 5, QTableWidgetItem(f"{stats.get('q25', 0):.6f}"))
-            self.table.setItem(row, start_col + 6, QTableWidgetItem(f"{stats.get('q75', 0):.6f}"))
-            self.table.setItem(row, start_col + 7, QTableWidgetItem(f"{stats.get('range', 0):.6f}"))
-            self.table.setItem(row, start_col + 8, QTableWidgetItem(f"{stats.get('variance', 0):.6f}"))
-        
-        # Add Channel 0 statistics (columns 1-9)
-        add_stats(stats_ch0, 1)
-        
-        # Add Channel 1 statistics (columns 10-18) if available
+            sweep_num = self.model.record_count() + 1
+        
+        # Channel 0 statistics (columns 1-9), Channel 1 (columns 10-18) left empty if not available
+        row = (sweep_num,) + tuple(stats_ch0.get(key, 0) for key in STATISTICS_KEYS)
         if stats_ch1:
-            add_stats(stats_ch1, 10)
+            row += tuple(stats_ch1.get(key, 0) for key in STATISTICS_KEYS)
         else:
-            # Fill with empty strings if Ch1 not available
-            for col in range(10, 19):
-                self.table.setItem(row, col, QTableWidgetItem(""))
-        
-        # Resize columns to content
-        self.table.resizeColumnsToContents()
-    
-    def copy_selected(self):
-        """Copy selected rows to clipboard"""
-        selection = self.table.selectedIndexes()
-        if not selection:
-            return
-        
-        # Get unique rows
-        rows = sorted(set(index.row() for index in selection))
-        
-        lines = []
-        # Header
-        headers = []
-        for col in range(self.table.columnCount()):
-            headers.append(self.table.horizontalHeaderItem(col).text())
-        lines.append("\t".join(headers))
-        
-        # Data rows
-        for row in rows:
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                row_data.append(item.text() if item else "")
-            lines.append("\t".join(row_data))
-        
-        self.app.clipboard().setText("\n".join(lines))
-    
-    def copy_all(self):
-        """Copy all rows to clipboard"""
-        if self.table.rowCount() == 0:
-            return
-        
-        # Select all
-        self.table.selectAll()
-        self.copy_selected()
-    
-    def clear_all(self):
-        """Clear all statistics"""
-        self.table.setRowCount(0)
+            row += (None,) * len(STATISTICS_KEYS)
+        self.model.append_rows([row])
 
 
-class PeaksTableDialog(QDialog):
+class PeaksTableDialog(RecordTableDialog):
     """Dialog for displaying detected peaks in a table"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Peaks Table")
-        self.setModal(False)
-        self.setMinimumSize(600, 400)
-        
-        layout = QVBoxLayout()
-        
-        # Table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels([
-            "Peak", "Index", "Time (s)", "Value", "Type"
-        ])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        layout.addWidget(self.table)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        copy_btn = QPushButton("Copy Selected")
-        copy_btn.clicked.connect(self.copy_selected)
-        button_layout.addWidget(copy_btn)
-        
-        copy_all_btn = QPushButton("Copy All")
-        copy_all_btn.clicked.connect(self.copy_all)
-        button_layout.addWidget(copy_all_btn)
-        
-        clear_btn = QPushButton("Clear")
-        clear_btn.clicked.connect(self.clear_all)
-        button_layout.addWidget(clear_btn)
-        
-        button_layout.addStretch()
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(self.accept)
-        button_layout.addWidget(close_btn)
-        
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-        
-        # Clipboard
-        self.app = QApplication.instance()
+    TITLE = "Peaks Table"
+    HEADERS = ("Peak", "Index", "Time (s)", "Value", "Type")
+    FORMATS = (None, None, '.6f', '.6f', None)
     
     def add_peaks(self, peaks: List[Peak], sweep_num: int = None):
         """Add peaks to the table"""
         if not peaks:
             return
         
-        for i, peak in enumerate(peaks):
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            peak_num = row + 1
-            
-            self.table.setItem(row, 0, QTableWidgetItem(str(peak_num)))
-            self.table.setItem(row, 1, QTableWidgetItem(str(peak.index)))
-            self.table.setItem(row, 2, QTableWidgetItem(f"{peak.time:.6f}"))
-            self.table.setItem(row, 3, QTableWidgetItem(f"{peak.value:.6f}"))
-            self.table.setItem(row, 4, QTableWidgetItem("Peak" if peak.is_max else "Trough"))
+        first = self.model.record_count()
+        rows = [
+            (first + i + 1, peak.index, peak.time, peak.value, "Peak" if peak.is_max else "Trough")
+            for i, peak in enumerate(peaks)
+        ]
         
-        # Resize columns to content
-        self.table.resizeColumnsToContents()
-    
-    def copy_selected(self):
-        """Copy selected rows to clipboard"""
-        selection = self.table.selectedIndexes()
-        if not selection:
-            return
-        
-        # Get unique rows
-        rows = sorted(set(index.row() for index in selection))
-        
-        lines = []
-        # Header
-        headers = []
-        for col in range(self.table.columnCount()):
-            headers.append(self.table.horizontalHeaderItem(col).text())
-        lines.append("\t".join(headers))
-        
-        # Data rows
-        for row in rows:
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                row_data.append(item.text() if item else "")
-            lines.append("\t".join(row_data))
-        
-        self.app.clipboard().setText("\n".join(lines))
-    
-    def copy_all(self):
-        """Copy all rows to clipboard"""
-        if self.table.rowCount() == 0:
-            return
-        
-        # Select all
-        self.table.selectAll()
-        self.copy_selected()
-    
-    def clear_all(self):
-        """Clear all peaks"""
-        self.table.setRowCount(0)
+        self.append_rows(rows)
 
 
 class SaveDialog(QDialog):
@@ -1385,6 +1371,22 @@ class SaveDialog(QDialog):
         return self.save_between_cursors_check.isChecked()
 
 
+# pyqtgraph color codes offered by TraceColorDialog and their RGB values
+COLOR_CODE_RGB = {
+    'k': (0, 0, 0),
+    'r': (255, 0, 0),
+    'b': (0, 0, 255),
+    'g': (0, 128, 0),
+    'c': (0, 255, 255),
+    'm': (255, 0, 255),
+    'y': (255, 255, 0),
+    'gray': (128, 128, 128),
+}
+RGB_COLOR_CODE = {rgb: code for code, rgb in COLOR_CODE_RGB.items()}
+PRESET_COLORS = (('Black', 'k'), ('Red', 'r'), ('Blue', 'b'), ('Green', 'g'),
+                 ('Cyan', 'c'), ('Magenta', 'm'), ('Yellow', 'y'), ('Gray', 'gray'))
+
+
 class TraceColorDialog(QDialog):
     """Dialog for trace color settings"""
     def __init__(self, parent=None, channel0_color: str = 'k', channel1_color: str = 'k'):
@@ -1405,7 +1407,7 @@ class TraceColorDialog(QDialog):
         self.ch0_color_btn.setFixedSize(50, 30)
         self.ch0_color = self._string_to_qcolor(channel0_color)
         self._update_color_button(self.ch0_color_btn, self.ch0_color)
-        self.ch0_color_btn.clicked.connect(lambda: self._pick_color('ch0'))
+        self.ch0_color_btn.clicked.connect(partial(self._pick_color, 'ch0'))
         ch0_layout.addWidget(self.ch0_color_btn)
         ch0_layout.addStretch()
         layout.addLayout(ch0_layout)
@@ -1417,7 +1419,7 @@ class TraceColorDialog(QDialog):
         self.ch1_color_btn.setFixedSize(50, 30)
         self.ch1_color = self._string_to_qcolor(channel1_color)
         self._update_color_button(self.ch1_color_btn, self.ch1_color)
-        self.ch1_color_btn.clicked.connect(lambda: self._pick_color('ch1'))
+        self.ch1_color_btn.clicked.connect(partial(self._pick_color, 'ch1'))
         ch1_layout.addWidget(self.ch1_color_btn)
         ch1_layout.addStretch()
         layout.addLayout(ch1_layout)
@@ -1426,12 +1428,10 @@ class TraceColorDialog(QDialog):
         preset_layout = QVBoxLayout()
         preset_layout.addWidget(QLabel("Preset Colors:"))
         preset_buttons = QHBoxLayout()
-        preset_colors = [('Black', 'k'), ('Red', 'r'), ('Blue', 'b'), ('Green', 'g'), 
-                        ('Cyan', 'c'), ('Magenta', 'm'), ('Yellow', 'y'), ('Gray', 'gray')]
-        for name, color_code in preset_colors:
+        for name, color_code in PRESET_COLORS:
             btn = QPushButton(name)
             btn.setMaximumWidth(70)
-            btn.clicked.connect(lambda checked, cc=color_code: self._set_both_colors(cc))
+            btn.clicked.connect(partial(self._set_both_colors, color_code))
             preset_buttons.addWidget(btn)
         preset_layout.addLayout(preset_buttons)
         layout.addLayout(preset_layout)
@@ -1445,41 +1445,13 @@ class TraceColorDialog(QDialog):
     
     def _string_to_qcolor(self, color_str: str) -> QColor:
         """Convert color string to QColor"""
-        color_map = {
-            'k': QColor(0, 0, 0),
-            'r': QColor(255, 0, 0),
-            'b': QColor(0, 0, 255),
-            'g': QColor(0, 128, 0),
-            'c': QColor(0, 255, 255),
-            'm': QColor(255, 0, 255),
-            'y': QColor(255, 255, 0),
-            'gray': QColor(128, 128, 128),
-        }
-        return color_map.get(color_str, QColor(0, 0, 0))
+        return QColor(*COLOR_CODE_RGB.get(color_str, (0, 0, 0)))
     
     def _qcolor_to_string(self, color: QColor):
         """Convert QColor to color string or tuple for pyqtgraph"""
-        r, g, b = color.red(), color.green(), color.blue()
-        # Check for common colors
-        if r == 0 and g == 0 and b == 0:
-            return 'k'
-        elif r == 255 and g == 0 and b == 0:
-            return 'r'
-        elif r == 0 and g == 0 and b == 255:
-            return 'b'
-        elif r == 0 and g == 128 and b == 0:
-            return 'g'
-        elif r == 0 and g == 255 and b == 255:
-            return 'c'
-        elif r == 255 and g == 0 and b == 255:
-            return 'm'
-        elif r == 255 and g == 255 and b == 0:
-            return 'y'
-        elif r == 128 and g == 128 and b == 128:
-            return 'gray'
-        else:
-            # Return as RGB tuple for pyqtgraph (values 0-255)
-            return (r, g, b)
+        rgb = (color.red(), color.green(), color.blue())
+        # Common colors map back to their code, anything else stays an RGB tuple (0-255)
+        return RGB_COLOR_CODE.get(rgb, rgb)
     
     def _update_color_button(self, btn: QPushButton, color: QColor):
         """Update button to show current color"""
@@ -1572,6 +1544,8 @@ class BaselineCorrectionDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Baseline Correction")
         self.setModal(True)
+        self.cursor1_y_ch0 = cursor1_y_ch0
+        self.cursor1_y_ch1 = cursor1_y_ch1
         
         layout = QVBoxLayout()
         
@@ -1602,7 +1576,7 @@ class BaselineCorrectionDialog(QDialog):
         
         # Use cursor 1 button
         use_cursor_btn = QPushButton("Use Cursor 1 Value")
-        use_cursor_btn.clicked.connect(lambda: self._use_cursor1_value(cursor1_y_ch0, cursor1_y_ch1))
+        use_cursor_btn.clicked.connect(self._use_cursor1_value)
         form_layout.addRow("", use_cursor_btn)
         
         # Status label
@@ -1626,8 +1600,9 @@ class BaselineCorrectionDialog(QDialog):
         
         self.setLayout(layout)
     
-    def _use_cursor1_value(self, cursor1_y_ch0, cursor1_y_ch1):
+    def _use_cursor1_value(self):
         """Set offset from cursor 1 value"""
+        cursor1_y_ch0, cursor1_y_ch1 = self.cursor1_y_ch0, self.cursor1_y_ch1
         channel = self.channel_combo.currentIndex()
         if channel == 0 and cursor1_y_ch0 is not None:
             self.offset_spin.setValue(cursor1_y_ch0)
@@ -1662,6 +1637,12 @@ class BaselineCorrectionDialog(QDialog):
 class ABFViewerMainWindow(QMainWindow):
     """Main application window"""
     
+    SWEEP_CACHE_SIZE = 8  # (sweep, channel) entries kept by _get_sweep
+    
+    # (job id, future) of a finished background block detection; emitted from
+    # the worker thread and delivered to the GUI thread as a queued call
+    blocks_detected = Signal(int, object)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Synapse ABF Viewer")
@@ -1672,12 +1653,15 @@ class ABFViewerMainWindow(QMainWindow):
         
         # UI state
         self.current_file_path: Optional[str] = None
+        # ABF listing of the current file's folder: (folder, mtime_ns, files, index by path)
+        self._abf_dir_cache: Optional[Tuple[Path, int, List[str], Dict[str, int]]] = None
         self.peaks: List[Peak] = []
         self.measurements_table: Optional[MeasurementsTableDialog] = None
         self.statistics_table: Optional[StatisticsTableDialog] = None
         self.peaks_table: Optional[PeaksTableDialog] = None
         self.blocks_table: Optional[BlocksTableDialog] = None
-        self.detected_blocks: List[Dict] = []  # Store detected blocks for marker updates
+        # Detected blocks grouped by sweep number, for marker updates on sweep changes
+        self.detected_blocks: Dict[int, List[Dict]] = {}
         self.baseline_offset_ch0: float = 0.0
         self.baseline_offset_ch1: float = 0.0
         
@@ -1686,11 +1670,39 @@ class ABFViewerMainWindow(QMainWindow):
         self.filtered_data_ch1: Optional[np.ndarray] = None
         self.filtered_time_ch0: Optional[np.ndarray] = None  # Store time array for filtered data
         self.filtered_time_ch1: Optional[np.ndarray] = None
+        # Per-channel buffers backing filtered_data_chN, reused across sweeps of a file
+        self._filter_buffers: Dict[int, np.ndarray] = {}
+        # Recently used sweeps by (sweep, channel); entries are shared, never mutated
+        self._sweep_cache: 'OrderedDict[Tuple[int, int], SweepData]' = OrderedDict()
         
         # Trace color settings (default black)
         self.trace_color_ch0: str = 'k'
         self.trace_color_ch1: str = 'k'
         
+        # Command waveform state last requested, so repeated toggles don't replot
+        self._command_waveform_shown = False
+        
+        # Coalesce replots requested in quick succession (e.g. scrubbing the sweep
+        # spin box) into one per ~60 Hz frame
+        self._replot_timer = QTimer(self)
+        self._replot_timer.setSingleShot(True)
+        self._replot_timer.setInterval(16)
+        self._replot_timer.timeout.connect(self._refresh_sweep_view)
+        
+        # Block detection runs on a worker thread; results older than the
+        # current job id (cancelled, or from a previous file) are dropped
+        self._analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analysis')
+        self._block_job = 0
+        self._block_progress: Optional[QProgressDialog] = None
+        self.blocks_detected.connect(self._on_blocks_detected)
+        
+        # Cursor readout in the status bar, refreshed at most ~30 times a second while dragging
+        self._pending_cursor_label: Optional[Tuple[int, float, float]] = None
+        self._cursor_label_timer = QTimer(self)
+        self._cursor_label_timer.setSingleShot(True)
+        self._cursor_label_timer.setInterval(33)
+        self._cursor_label_timer.timeout.connect(self._update_cursor_label)
+        
         # Create UI
         self._create_menu_bar()
         self._create_toolbar()
@@ -2020,8 +2032,11 @@ class ABFViewerMainWindow(QMainWindow):
         """Create status bar"""
         self.statusBar().showMessage("Ready")
     
-    def _update_ui(self):
-        """Update UI based on current state"""
+    def _update_ui(self, current_file_path: Optional[str] = None):
+        """Update UI based on current state, recording the path of a newly loaded file if given"""
+        if current_file_path is not None:
+            self.current_file_path = current_file_path
+        
         if not self.abf_handler.is_loaded:
             self.file_info_label.setText("No file loaded")
             self.sweep_spin.setEnabled(False)
@@ -2037,9 +2052,11 @@ class ABFViewerMainWindow(QMainWindow):
         info_text += f"<b>Sample Rate:</b> {info['sample_rate']:.0f} Hz"
         self.file_info_label.setText(info_text)
         
-        # Update sweep controls
-        self.sweep_spin.setMaximum(self.abf_handler.sweep_count - 1)
-        self.sweep_spin.setValue(self.abf_handler.current_sweep)
+        # Update sweep controls. The handler is already on current_sweep and the
+        # plot is redrawn below, so on_sweep_changed must not queue another replot
+        with QSignalBlocker(self.sweep_spin):
+            self.sweep_spin.setMaximum(self.abf_handler.sweep_count - 1)
+            self.sweep_spin.setValue(self.abf_handler.current_sweep)
         self.sweep_spin.setEnabled(True)
         
         # Update plot
@@ -2061,9 +2078,10 @@ class ABFViewerMainWindow(QMainWindow):
         channel1_sweep = None
         channel0_units = ""
         channel1_units = ""
+        adc_units = self.abf_handler.get_protocol_info().adc_units
         
         if self.abf_handler.channel_count > 0:
-            channel0_sweep_orig = self.abf_handler.get_sweep(
+            channel0_sweep_orig = self._get_sweep(
                 self.abf_handler.current_sweep, 0
             )
             if channel0_sweep_orig:
@@ -2076,17 +2094,17 @@ class ABFViewerMainWindow(QMainWindow):
                         time=self.filtered_time_ch0,
                         data=self.filtered_data_ch0,
                         command=channel0_sweep_orig.command,
-                        sample_rate=channel0_sweep_orig.sample_rate
+                        sample_rate=channel0_sweep_orig.sample_rate,
+                        has_command=channel0_sweep_orig.has_command
                     )
                 else:
                     channel0_sweep = channel0_sweep_orig
                 
-                info = self.abf_handler.get_protocol_info()
-                if len(info.adc_units) > 0:
-                    channel0_units = info.adc_units[0]
+                if len(adc_units) > 0:
+                    channel0_units = adc_units[0]
         
         if self.abf_handler.channel_count > 1:
-            channel1_sweep_orig = self.abf_handler.get_sweep(
+            channel1_sweep_orig = self._get_sweep(
                 self.abf_handler.current_sweep, 1
             )
             if channel1_sweep_orig:
@@ -2099,14 +2117,14 @@ class ABFViewerMainWindow(QMainWindow):
                         time=self.filtered_time_ch1,
                         data=self.filtered_data_ch1,
                         command=channel1_sweep_orig.command,
-                        sample_rate=channel1_sweep_orig.sample_rate
+                        sample_rate=channel1_sweep_orig.sample_rate,
+                        has_command=channel1_sweep_orig.has_command
                     )
                 else:
                     channel1_sweep = channel1_sweep_orig
                 
-                info = self.abf_handler.get_protocol_info()
-                if len(info.adc_units) > 1:
-                    channel1_units = info.adc_units[1]
+                if len(adc_units) > 1:
+                    channel1_units = adc_units[1]
         
         show_command = self.show_command_action.isChecked()
         # Plot without filter parameters since we're using pre-filtered data
@@ -2120,10 +2138,10 @@ class ABFViewerMainWindow(QMainWindow):
         self.plot_widget.plot0.set_trace_color(self.trace_color_ch0)
         self.plot_widget.plot1.set_trace_color(self.trace_color_ch1)
         
-        # Apply grid visibility
-        if hasattr(self, 'show_grid_action') and self.show_grid_action:
-            self.plot_widget.plot0.set_grid_visible(self.show_grid_action.isChecked())
-            self.plot_widget.plot1.set_grid_visible(self.show_grid_action.isChecked())
+        # Apply grid visibility (menu actions exist from _create_menu_bar on)
+        show_grid = self.show_grid_action.isChecked()
+        self.plot_widget.plot0.set_grid_visible(show_grid)
+        self.plot_widget.plot1.set_grid_visible(show_grid)
         
         # Update status label
         self.status_label.setText(
@@ -2131,6 +2149,7 @@ class ABFViewerMainWindow(QMainWindow):
             f"Channels: {self.abf_handler.channel_count}"
         )
     
+    @Slot()
     def open_file(self):
         """Open ABF file"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -2144,21 +2163,41 @@ class ABFViewerMainWindow(QMainWindow):
                 # Reset sweep to first sweep (0) after file is loaded
                 if self.abf_handler.is_loaded:
                     self.abf_handler.set_current_sweep(0)
-                self.current_file_path = file_path
                 # Update UI (which will update plot with sweep 0)
-                self._update_ui()
+                self._update_ui(current_file_path=file_path)
             else:
                 QMessageBox.critical(self, "Error", "Failed to load ABF file.")
     
     def _get_abf_files_in_directory(self) -> List[str]:
-        """Get list of all ABF files in the current file's directory, sorted alphabetically"""
+        """
+        Get list of all ABF files in the current file's directory, sorted alphabetically
+        
+        The listing is cached and only re-read when the directory's modification
+        time changes (a file was added, removed or renamed).
+        """
         if not self.current_file_path:
             return []
         
         file_dir = Path(self.current_file_path).parent
-        abf_files = sorted(file_dir.glob("*.abf"), key=lambda p: p.name.lower())
-        return [str(f) for f in abf_files]
+        try:
+            mtime = file_dir.stat().st_mtime_ns
+        except OSError:
+            return []
+        
+        cache = self._abf_dir_cache
+        if cache is None or cache[0] != file_dir or cache[1] != mtime:
+            abf_files = [str(f) for f in sorted(file_dir.glob("*.abf"), key=lambda p: p.name.lower())]
+            cache = (file_dir, mtime, abf_files, {f: i for i, f in enumerate(abf_files)})
+            self._abf_dir_cache = cache
+        return cache[2]
     
+    def _current_file_index(self) -> Optional[int]:
+        """Position of the current file in the cached directory listing (None if not listed)"""
+        if self._abf_dir_cache is None:
+            return None
+        return self._abf_dir_cache[3].get(self.current_file_path)
+    
+    @Slot()
     def previous_file(self):
         """Open previous ABF file in the folder"""
         if not self.current_file_path:
@@ -2170,17 +2209,17 @@ class ABFViewerMainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No ABF files found in directory.")
             return
         
-        try:
-            current_index = abf_files.index(self.current_file_path)
-            if current_index > 0:
-                prev_file = abf_files[current_index - 1]
-                self._load_file_direct(prev_file)
-            else:
-                QMessageBox.information(self, "Info", "Already at the first file in the folder.")
-        except ValueError:
+        current_index = self._current_file_index()
+        if current_index is None:
             # Current file not in list (shouldn't happen, but handle gracefully)
             QMessageBox.warning(self, "Warning", "Current file not found in directory list.")
+        elif current_index > 0:
+            prev_file = abf_files[current_index - 1]
+            self._load_file_direct(prev_file)
+        else:
+            QMessageBox.information(self, "Info", "Already at the first file in the folder.")
     
+    @Slot()
     def next_file(self):
         """Open next ABF file in the folder"""
         if not self.current_file_path:
@@ -2192,16 +2231,15 @@ class ABFViewerMainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No ABF files found in directory.")
             return
         
-        try:
-            current_index = abf_files.index(self.current_file_path)
-            if current_index < len(abf_files) - 1:
-                next_file = abf_files[current_index + 1]
-                self._load_file_direct(next_file)
-            else:
-                QMessageBox.information(self, "Info", "Already at the last file in the folder.")
-        except ValueError:
+        current_index = self._current_file_index()
+        if current_index is None:
             # Current file not in list (shouldn't happen, but handle gracefully)
             QMessageBox.warning(self, "Warning", "Current file not found in directory list.")
+        elif current_index < len(abf_files) - 1:
+            next_file = abf_files[current_index + 1]
+            self._load_file_direct(next_file)
+        else:
+            QMessageBox.information(self, "Info", "Already at the last file in the folder.")
     
     def _load_file_direct(self, file_path: str):
         """Load a file directly without showing file dialog (used by previous/next file)"""
@@ -2211,9 +2249,8 @@ class ABFViewerMainWindow(QMainWindow):
             # Reset sweep to first sweep (0) after file is loaded
             if self.abf_handler.is_loaded:
                 self.abf_handler.set_current_sweep(0)
-            self.current_file_path = file_path
             # Update UI (which will update plot with sweep 0)
-            self._update_ui()
+            self._update_ui(current_file_path=file_path)
         else:
             QMessageBox.critical(self, "Error", f"Failed to load ABF file:\n{file_path}")
     
@@ -2228,6 +2265,8 @@ class ABFViewerMainWindow(QMainWindow):
         self.filtered_data_ch1 = None
         self.filtered_time_ch0 = None
         self.filtered_time_ch1 = None
+        self._filter_buffers = {}
+        self._sweep_cache.clear()
         
         # Clear peaks
         self.peaks = []
@@ -2237,8 +2276,7 @@ class ABFViewerMainWindow(QMainWindow):
         self.trace_color_ch1 = 'k'
         
         # Reset grid visibility
-        if self.show_grid_action:
-            self.show_grid_action.setChecked(True)
+        self.show_grid_action.setChecked(True)
         
         # Disable cursors and unlock
         if self.plot_widget.plot0.cursor1_enabled:
@@ -2252,15 +2290,12 @@ class ABFViewerMainWindow(QMainWindow):
         self.plot_widget.plot0.set_cursors_locked(False)
         self.plot_widget.plot1.set_cursors_locked(False)
         
-        # Update cursor button states
-        self.cursor1_btn.setChecked(False)
-        self.cursor2_btn.setChecked(False)
-        if hasattr(self, 'cursor1_action'):
-            self.cursor1_action.setChecked(False)
-        if hasattr(self, 'cursor2_action'):
-            self.cursor2_action.setChecked(False)
-        if hasattr(self, 'lock_cursors_action'):
-            self.lock_cursors_action.setChecked(False)
+        # Update cursor button states (the cursors are already off, so their
+        # toggle slots have nothing left to do)
+        for widget in (self.cursor1_btn, self.cursor2_btn, self.cursor1_action,
+                       self.cursor2_action, self.lock_cursors_action):
+            with QSignalBlocker(widget):
+                widget.setChecked(False)
         
         # Clear measurements table
         if self.measurements_table is not None:
@@ -2278,24 +2313,56 @@ class ABFViewerMainWindow(QMainWindow):
         if self.blocks_table is not None:
             self.blocks_table.clear_all()
         
-        # Clear detected blocks
-        self.detected_blocks = []
+        # Clear detected blocks (and drop any detection still running)
+        self.detected_blocks = {}
+        self._block_job += 1
+        self._close_block_progress()
         
         # Clear block markers from plots
         self.plot_widget.plot0.clear_block_markers()
         
         # Clear cursor label and status
+        self._cursor_label_timer.stop()
+        self._pending_cursor_label = None
         self.cursor_label.setText("")
         self.status_label.setText("Ready")
     
+    def _get_sweep(self, sweep_number: int, channel: int = 0) -> Optional[SweepData]:
+        """Get a sweep through a small LRU cache so repeated actions on it don't re-read the file"""
+        key = (sweep_number, channel)
+        sweep = self._sweep_cache.get(key)
+        if sweep is not None:
+            self._sweep_cache.move_to_end(key)
+            return sweep
+        
+        sweep = self.abf_handler.get_sweep(sweep_number, channel)
+        if sweep is not None:
+            self._sweep_cache[key] = sweep
+            if len(self._sweep_cache) > self.SWEEP_CACHE_SIZE:
+                self._sweep_cache.popitem(last=False)
+        return sweep
+    
+    @staticmethod
+    def _slice_between(time: np.ndarray, x1: float, x2: float) -> Tuple[int, int]:
+        """Slice bounds of the samples with x1 <= time <= x2 (time is sorted)"""
+        return (int(np.searchsorted(time, x1, side='left')),
+                int(np.searchsorted(time, x2, side='right')))
+    
+    @staticmethod
+    def _time_to_index(sweep: SweepData, t: float) -> int:
+        """Index of the sample nearest to time t (sweeps are uniformly sampled)"""
+        idx = int(np.floor((t - float(sweep.time[0])) * sweep.sample_rate + 0.5))
+        return min(max(idx, 0), len(sweep.data) - 1)
+    
     def _reset_plot_views(self):
         """Reset plot views to auto-range showing all data"""
         # Auto-range both plots to show all data
-        if self.plot_widget.plot0.data_plot is not None:
+        if self.plot_widget.plot0.current_data is not None:
             self.plot_widget.plot0.getViewBox().autoRange()
-        if self.plot_widget.plot1.data_plot is not None:
+        if self.plot_widget.plot1.current_data is not None:
             self.plot_widget.plot1.getViewBox().autoRange()
     
+    @Slot(int)
     def on_sweep_changed(self, value: int):
         """Handle sweep change"""
         if self.abf_handler.is_loaded:
@@ -2305,53 +2372,83 @@ class ABFViewerMainWindow(QMainWindow):
             self.filtered_data_ch1 = None
             self.filtered_time_ch0 = None
             self.filtered_time_ch1 = None
-            self._update_plot()
-            
-            # Update block markers for new sweep
-            if self.detected_blocks:
-                current_sweep_blocks = [b for b in self.detected_blocks if b.get('sweep_number') == value]
-                if current_sweep_blocks:
-                    self.plot_widget.plot0.mark_blocks(current_sweep_blocks)
-                else:
-                    self.plot_widget.plot0.clear_block_markers()
+            self._replot_timer.start()
+    
+    @Slot()
+    def _refresh_sweep_view(self):
+        """Redraw the current sweep and its block markers (runs once per burst of sweep changes)"""
+        self._update_plot()
+        
+        # Update block markers for new sweep
+        if self.abf_handler.is_loaded and self.detected_blocks:
+            current_sweep_blocks = self.detected_blocks.get(self.abf_handler.current_sweep)
+            if current_sweep_blocks:
+                self.plot_widget.plot0.mark_blocks(current_sweep_blocks)
+            else:
+                self.plot_widget.plot0.clear_block_markers()
     
+    @Slot()
     def previous_sweep(self):
         """Go to previous sweep"""
         if self.abf_handler.is_loaded and self.abf_handler.current_sweep > 0:
             self.sweep_spin.setValue(self.abf_handler.current_sweep - 1)
     
+    @Slot()
     def next_sweep(self):
         """Go to next sweep"""
         if self.abf_handler.is_loaded:
             if self.abf_handler.current_sweep < self.abf_handler.sweep_count - 1:
                 self.sweep_spin.setValue(self.abf_handler.current_sweep + 1)
     
+    @Slot(bool)
     def toggle_cursor1(self, enabled: bool):
         """Toggle cursor 1 on both plots"""
-        self.cursor1_action.setChecked(enabled)
-        self.cursor1_btn.setChecked(enabled)
-        if enabled:
-            self.plot_widget.plot0.enable_cursor1()
-            self.plot_widget.plot1.enable_cursor1()
-        else:
-            self.plot_widget.plot0.disable_cursor1()
-            self.plot_widget.plot1.disable_cursor1()
+        # Sync the action and button without re-entering this slot through their signals
+        with QSignalBlocker(self.cursor1_action), QSignalBlocker(self.cursor1_btn):
+            self.cursor1_action.setChecked(enabled)
+            self.cursor1_btn.setChecked(enabled)
+        
+        # Both plots change together, so repaint them once
+        self.plot_widget.setUpdatesEnabled(False)
+        try:
+            if enabled:
+                self.plot_widget.plot0.enable_cursor1()
+                self.plot_widget.plot1.enable_cursor1()
+            else:
+                self.plot_widget.plot0.disable_cursor1()
+                self.plot_widget.plot1.disable_cursor1()
+        finally:
+            self.plot_widget.setUpdatesEnabled(True)
     
+    @Slot(bool)
     def toggle_cursor2(self, enabled: bool):
         """Toggle cursor 2 on both plots"""
-        self.cursor2_action.setChecked(enabled)
-        self.cursor2_btn.setChecked(enabled)
-        if enabled:
-            self.plot_widget.plot0.enable_cursor2()
-            self.plot_widget.plot1.enable_cursor2()
-        else:
-            self.plot_widget.plot0.disable_cursor2()
-            self.plot_widget.plot1.disable_cursor2()
+        # Sync the action and button without re-entering this slot through their signals
+        with QSignalBlocker(self.cursor2_action), QSignalBlocker(self.cursor2_btn):
+            self.cursor2_action.setChecked(enabled)
+            self.cursor2_btn.setChecked(enabled)
+        
+        # Both plots change together, so repaint them once
+        self.plot_widget.setUpdatesEnabled(False)
+        try:
+            if enabled:
+                self.plot_widget.plot0.enable_cursor2()
+                self.plot_widget.plot1.enable_cursor2()
+            else:
+                self.plot_widget.plot0.disable_cursor2()
+                self.plot_widget.plot1.disable_cursor2()
+        finally:
+            self.plot_widget.setUpdatesEnabled(True)
     
+    @Slot(bool)
     def toggle_command_waveform(self, show: bool):
         """Toggle command waveform display"""
-        self._update_plot()
+        if show == self._command_waveform_shown:
+            return
+        self._command_waveform_shown = show
+        self._replot_timer.start()
     
+    @Slot()
     def change_trace_colors(self):
         """Open dialog to change trace colors"""
         dialog = TraceColorDialog(self, self.trace_color_ch0, self.trace_color_ch1)
@@ -2363,26 +2460,51 @@ class ABFViewerMainWindow(QMainWindow):
                 self.plot_widget.plot0.set_trace_color(self.trace_color_ch0)
                 self.plot_widget.plot1.set_trace_color(self.trace_color_ch1)
     
+    @Slot(bool)
     def toggle_grid(self, visible: bool):
         """Toggle grid visibility on both plots"""
         self.plot_widget.plot0.set_grid_visible(visible)
         self.plot_widget.plot1.set_grid_visible(visible)
     
+    @Slot(float, float)
     def _on_cursor1_set(self, x: float, y: float):
         """Handle cursor 1 position"""
-        self.cursor_label.setText(f"C1: ({x:.4f} s, {y:.4f})")
+        self._queue_cursor_label(1, x, y)
     
+    @Slot(float, float)
     def _on_cursor2_set(self, x: float, y: float):
         """Handle cursor 2 position"""
+        self._queue_cursor_label(2, x, y)
+    
+    def _queue_cursor_label(self, cursor: int, x: float, y: float):
+        """Remember the latest cursor position; the label is refreshed at most every timer interval"""
+        self._pending_cursor_label = (cursor, x, y)
+        # Not restarted while running, so the label keeps updating during a drag
+        if not self._cursor_label_timer.isActive():
+            self._cursor_label_timer.start()
+    
+    @Slot()
+    def _update_cursor_label(self):
+        """Show the most recent cursor position in the status bar"""
+        if self._pending_cursor_label is None:
+            return
+        cursor, x, y = self._pending_cursor_label
+        self._pending_cursor_label = None
+        
+        if cursor == 1:
+            self.cursor_label.setText(f"C1: ({x:.4f} s, {y:.4f})")
+            return
+        
         # Get positions from plot 0 (they should be synchronized)
-        x1, y1, x2, y2 = self.plot_widget.plot0.get_cursor_positions()
         if self.plot_widget.plot0.cursor1_enabled and self.plot_widget.plot0.cursor2_enabled:
+            x1, y1, x2, y2 = self.plot_widget.plot0.get_cursor_positions()
             self.cursor_label.setText(
                 f"C1: ({x1:.4f} s, {y1:.4f}) | C2: ({x2:.4f} s, {y2:.4f})"
             )
         else:
             self.cursor_label.setText(f"C2: ({x:.4f} s, {y:.4f})")
     
+    @Slot()
     def add_measurement(self):
         """Add measurement to table (Ctrl+M) - both channels"""
         if not self.plot_widget.plot0.cursor1_enabled or not self.plot_widget.plot0.cursor2_enabled:
@@ -2397,40 +2519,39 @@ class ABFViewerMainWindow(QMainWindow):
         measurement_ch0 = AnalysisTools.calculate_measurement(x1_ch0, y1_ch0, x2_ch0, y2_ch0)
         measurement_ch1 = AnalysisTools.calculate_measurement(x1_ch1, y1_ch1, x2_ch1, y2_ch1) if self.abf_handler.channel_count > 1 else None
         
-        # Get or create measurements table
-        if self.measurements_table is None:
-            self.measurements_table = MeasurementsTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.measurements_table.show()
-        self.measurements_table.raise_()
-        self.measurements_table.activateWindow()
-        if self.measurements_table.isMinimized():
-            self.measurements_table.showNormal()
+        self._show_table('measurements_table', MeasurementsTableDialog)
         
         # Add measurement to table (both channels)
         self.measurements_table.add_measurement(measurement_ch0, measurement_ch1)
     
+    def _show_table(self, attr: str, dialog_class: type) -> RecordTableDialog:
+        """Show the table dialog stored in `attr`, creating it on first use, and bring it to front"""
+        dialog = getattr(self, attr)
+        if dialog is None:
+            dialog = dialog_class(self)
+            setattr(self, attr, dialog)
+        
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
+        if dialog.isMinimized():
+            dialog.showNormal()
+        return dialog
+    
+    @Slot()
     def show_measurements_table(self):
         """Show measurements table dialog"""
-        if self.measurements_table is None:
-            self.measurements_table = MeasurementsTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.measurements_table.show()
-        self.measurements_table.raise_()
-        self.measurements_table.activateWindow()
-        
-        # If window was minimized, restore it
-        if self.measurements_table.isMinimized():
-            self.measurements_table.showNormal()
+        self._show_table('measurements_table', MeasurementsTableDialog)
     
+    @Slot(bool)
     def toggle_lock_cursors(self, locked: bool):
         """Toggle cursor locking"""
         self.plot_widget.plot0.set_cursors_locked(locked)
         self.plot_widget.plot1.set_cursors_locked(locked)
-        self.lock_cursors_action.setChecked(locked)
+        with QSignalBlocker(self.lock_cursors_action):
+            self.lock_cursors_action.setChecked(locked)
     
+    @Slot()
     def baseline_correction(self):
         """Apply baseline correction"""
         # Get cursor 1 Y values from both plots (original data, not corrected)
@@ -2441,26 +2562,18 @@ class ABFViewerMainWindow(QMainWindow):
             # Get cursor 1 X position
             x1 = self.plot_widget.plot0.cursor1_line.value()
             # Get original data value at cursor 1 position (before baseline correction)
-            sweep_ch0 = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 0)
-            if sweep_ch0:
-                time_diff = np.abs(sweep_ch0.time - x1)
-                if len(time_diff) > 0:
-                    idx = np.argmin(time_diff)
-                    if idx < len(sweep_ch0.data):
-                        cursor1_y_ch0 = float(sweep_ch0.data[idx])
+            sweep_ch0 = self._get_sweep(self.abf_handler.current_sweep, 0)
+            if sweep_ch0 and len(sweep_ch0.data) > 0:
+                cursor1_y_ch0 = float(sweep_ch0.data[self._time_to_index(sweep_ch0, x1)])
         
         if self.abf_handler.channel_count > 1:
             if self.plot_widget.plot1.cursor1_enabled and self.plot_widget.plot1.cursor1_line:
                 # Get cursor 1 X position (synchronized with plot0)
                 x1 = self.plot_widget.plot0.cursor1_line.value() if self.plot_widget.plot0.cursor1_line else None
                 if x1 is not None:
-                    sweep_ch1 = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 1)
-                    if sweep_ch1:
-                        time_diff = np.abs(sweep_ch1.time - x1)
-                        if len(time_diff) > 0:
-                            idx = np.argmin(time_diff)
-                            if idx < len(sweep_ch1.data):
-                                cursor1_y_ch1 = float(sweep_ch1.data[idx])
+                    sweep_ch1 = self._get_sweep(self.abf_handler.current_sweep, 1)
+                    if sweep_ch1 and len(sweep_ch1.data) > 0:
+                        cursor1_y_ch1 = float(sweep_ch1.data[self._time_to_index(sweep_ch1, x1)])
         
         # Create dialog with cursor 1 values
         dialog = BaselineCorrectionDialog(self, cursor1_y_ch0, cursor1_y_ch1)
@@ -2477,6 +2590,7 @@ class ABFViewerMainWindow(QMainWindow):
             # Update plot with baseline correction
             self._update_plot()
     
+    @Slot()
     def apply_filter(self):
         """Apply Gaussian lowpass filter to data - filters are permanent and cumulative"""
         if not self.abf_handler.is_loaded:
@@ -2484,7 +2598,7 @@ class ABFViewerMainWindow(QMainWindow):
             return
         
         # Get sample rate from current sweep
-        sweep = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 0)
+        sweep = self._get_sweep(self.abf_handler.current_sweep, 0)
         if not sweep:
             QMessageBox.warning(self, "Warning", "No data available to filter.")
             return
@@ -2511,134 +2625,15 @@ class ABFViewerMainWindow(QMainWindow):
                 x1, y1, x2, y2 = self.plot_widget.plot0.get_cursor_positions()
                 cursor_range = (x1, x2)
             
-            # Apply filter to channel 0
-            if channel == 0 or channel == -1:
-                sweep_ch0 = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 0)
-                if sweep_ch0:
-                    # Get current data (filtered if exists, otherwise original)
-                    if self.filtered_data_ch0 is not None:
-                        current_data = self.filtered_data_ch0.copy()
-                        current_time = self.filtered_time_ch0.copy()
-                    else:
-                        current_data = sweep_ch0.data.copy()
-                        current_time = sweep_ch0.time.copy()
-                    
-                    # Apply filter
-                    if filter_between_cursors and cursor_range:
-                        # Filter only between cursors
-                        x1, x2 = cursor_range
-                        if x1 > x2:
-                            x1, x2 = x2, x1
-                        
-                        mask = (current_time >= x1) & (current_time <= x2)
-                        mask_indices = np.where(mask)[0]
-                        
-                        if len(mask_indices) > 0:
-                            start_idx = int(mask_indices[0])
-                            end_idx = int(mask_indices[-1] + 1)
-                            
-                            # Calculate padding
-                            normalized_cutoff = cutoff / sample_rate
-                            if normalized_cutoff < 0.5:
-                                sigma_time = 0.1325 / normalized_cutoff
-                                sigma_samples = sigma_time * sample_rate
-                                padding_needed = int(6 * sigma_samples) + 10
-                            else:
-                                padding_needed = 100
-                            
-                            padding = min(padding_needed, start_idx, len(current_data) - end_idx)
-                            if padding > 0:
-                                padded_start = max(0, start_idx - padding)
-                                padded_end = min(len(current_data), end_idx + padding)
-                            else:
-                                padded_start = start_idx
-                                padded_end = end_idx
-                            
-                            padded_segment = current_data[padded_start:padded_end].copy()
-                            filtered_padded = AnalysisTools.gaussian_lowpass_filter(
-                                padded_segment, cutoff_freq=cutoff, sample_rate=sample_rate
-                            )
-                            
-                            segment_start_in_padded = start_idx - padded_start
-                            segment_end_in_padded = end_idx - padded_start
-                            filtered_segment = filtered_padded[segment_start_in_padded:segment_end_in_padded]
-                            
-                            if len(filtered_segment) == (end_idx - start_idx):
-                                current_data[start_idx:end_idx] = filtered_segment
-                    else:
-                        # Filter entire sweep
-                        current_data = AnalysisTools.gaussian_lowpass_filter(
-                            current_data, cutoff_freq=cutoff, sample_rate=sample_rate
-                        )
-                    
-                    # Store filtered data
-                    self.filtered_data_ch0 = current_data
-                    self.filtered_time_ch0 = current_time
+            if channel == 1 and self.abf_handler.channel_count < 2:
+                QMessageBox.warning(self, "Warning", "Channel 1 not available.")
+                return
             
-            # Apply filter to channel 1
-            if channel == 1 or channel == -1:
-                if self.abf_handler.channel_count > 1:
-                    sweep_ch1 = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 1)
-                    if sweep_ch1:
-                        # Get current data (filtered if exists, otherwise original)
-                        if self.filtered_data_ch1 is not None:
-                            current_data = self.filtered_data_ch1.copy()
-                            current_time = self.filtered_time_ch1.copy()
-                        else:
-                            current_data = sweep_ch1.data.copy()
-                            current_time = sweep_ch1.time.copy()
-                        
-                        # Apply filter (same logic as channel 0)
-                        if filter_between_cursors and cursor_range:
-                            x1, x2 = cursor_range
-                            if x1 > x2:
-                                x1, x2 = x2, x1
-                            
-                            mask = (current_time >= x1) & (current_time <= x2)
-                            mask_indices = np.where(mask)[0]
-                            
-                            if len(mask_indices) > 0:
-                                start_idx = int(mask_indices[0])
-                                end_idx = int(mask_indices[-1] + 1)
-                                
-                                normalized_cutoff = cutoff / sample_rate
-                                if normalized_cutoff < 0.5:
-                                    sigma_time = 0.1325 / normalized_cutoff
-                                    sigma_samples = sigma_time * sample_rate
-                                    padding_needed = int(6 * sigma_samples) + 10
-                                else:
-                                    padding_needed = 100
-                                
-                                padding = min(padding_needed, start_idx, len(current_data) - end_idx)
-                                if padding > 0:
-                                    padded_start = max(0, start_idx - padding)
-                                    padded_end = min(len(current_data), end_idx + padding)
-                                else:
-                                    padded_start = start_idx
-                                    padded_end = end_idx
-                                
-                                padded_segment = current_data[padded_start:padded_end].copy()
-                                filtered_padded = AnalysisTools.gaussian_lowpass_filter(
-                                    padded_segment, cutoff_freq=cutoff, sample_rate=sample_rate
-                                )
-                                
-                                segment_start_in_padded = start_idx - padded_start
-                                segment_end_in_padded = end_idx - padded_start
-                                filtered_segment = filtered_padded[segment_start_in_padded:segment_end_in_padded]
-                                
-                                if len(filtered_segment) == (end_idx - start_idx):
-                                    current_data[start_idx:end_idx] = filtered_segment
-                        else:
-                            current_data = AnalysisTools.gaussian_lowpass_filter(
-                                current_data, cutoff_freq=cutoff, sample_rate=sample_rate
-                            )
-                        
-                        # Store filtered data
-                        self.filtered_data_ch1 = current_data
-                        self.filtered_time_ch1 = current_time
-                elif channel == 1:
-                    QMessageBox.warning(self, "Warning", "Channel 1 not available.")
-                    return
+            # Apply filter to the selected channel(s), on top of any earlier filtering
+            channels = [0, 1] if channel == -1 else [channel]
+            for ch in channels:
+                if ch < self.abf_handler.channel_count:
+                    self._filter_channel(ch, cutoff, sample_rate, cursor_range)
             
             # Update plot with filter applied
             self._update_plot()
@@ -2648,6 +2643,66 @@ class ABFViewerMainWindow(QMainWindow):
             cursor_text = " between cursors" if filter_between_cursors else ""
             self.status_label.setText(f"Filter applied: {cutoff:.1f} Hz cutoff to {channel_text}{cursor_text}")
     
+    def _filter_channel(self, channel: int, cutoff: float, sample_rate: float,
+                        cursor_range: Optional[Tuple[float, float]] = None):
+        """Filter the current sweep of one channel into filtered_data_ch{channel}"""
+        sweep = self._get_sweep(self.abf_handler.current_sweep, channel)
+        if not sweep:
+            return
+        
+        data_attr = f'filtered_data_ch{channel}'
+        time_attr = f'filtered_time_ch{channel}'
+        if getattr(self, data_attr) is None:
+            # The filter never changes the time base, so it is shared with the sweep
+            setattr(self, time_attr, sweep.time)
+            if cursor_range is None:
+                # First whole-sweep filter: filter straight from the sweep into the
+                # buffer rather than copying the sweep there first
+                data = self._filter_workspace(sweep, copy=False)
+                result = AnalysisTools.gaussian_lowpass_filter(
+                    sweep.data, cutoff_freq=cutoff, sample_rate=sample_rate, out=data
+                )
+                if result is not data:
+                    # Out-of-range cutoffs return the input unfiltered
+                    data[...] = result
+                setattr(self, data_attr, data)
+                return
+            setattr(self, data_attr, self._filter_workspace(sweep))
+        
+        self._filter_trace(getattr(self, data_attr), getattr(self, time_attr),
+                           cutoff, sample_rate, cursor_range)
+    
+    def _filter_workspace(self, sweep: SweepData, copy: bool = True) -> np.ndarray:
+        """The channel's filter buffer sized for a sweep (grown only when a sweep is longer),
+        holding a copy of its data unless copy is False"""
+        n = len(sweep.data)
+        buffer = self._filter_buffers.get(sweep.channel)
+        if buffer is None or buffer.shape[0] < n or buffer.dtype != sweep.data.dtype:
+            buffer = np.empty(n, dtype=sweep.data.dtype)
+            self._filter_buffers[sweep.channel] = buffer
+        data = buffer[:n]
+        if copy:
+            data[...] = sweep.data
+        return data
+    
+    @classmethod
+    def _filter_trace(cls, data: np.ndarray, time: np.ndarray, cutoff: float, sample_rate: float,
+                      cursor_range: Optional[Tuple[float, float]] = None):
+        """Gaussian-filter a trace in place, either entirely or only between the cursor times"""
+        if cursor_range is None:
+            # The filter reads from its own padded copy, so writing back into data is safe
+            AnalysisTools.gaussian_lowpass_filter(
+                data, cutoff_freq=cutoff, sample_rate=sample_rate, out=data
+            )
+            return
+        
+        start_idx, end_idx = cls._slice_between(time, *sorted(cursor_range))
+        if end_idx > start_idx:
+            data[start_idx:end_idx] = AnalysisTools.gaussian_lowpass_filter_range(
+                data, start_idx, end_idx, cutoff_freq=cutoff, sample_rate=sample_rate
+            )
+    
+    @Slot()
     def detect_peaks(self):
         """Detect peaks in current sweep (channel 0) - between cursors if enabled"""
         if not self.abf_handler.is_loaded:
@@ -2675,7 +2730,7 @@ class ABFViewerMainWindow(QMainWindow):
             find_max = dialog.find_max_check.isChecked()
             
             # Detect peaks in channel 0 (current channel)
-            sweep = self.abf_handler.get_sweep(
+            sweep = self._get_sweep(
                 self.abf_handler.current_sweep,
                 0  # Always use channel 0 for peak detection
             )
@@ -2683,16 +2738,13 @@ class ABFViewerMainWindow(QMainWindow):
             if sweep:
                 # Extract data between cursors
                 if use_cursors:
-                    mask = (sweep.time >= x1) & (sweep.time <= x2)
-                    segment_data = sweep.data[mask]
-                    segment_time = sweep.time[mask]
+                    start_idx, end_idx = self._slice_between(sweep.time, x1, x2)
+                    segment_data = sweep.data[start_idx:end_idx]
+                    segment_time = sweep.time[start_idx:end_idx]
                     
                     if len(segment_data) == 0:
                         QMessageBox.warning(self, "Warning", "No data found between cursors.")
                         return
-                    
-                    # Find the starting index offset for proper peak indexing
-                    start_idx = np.where(mask)[0][0] if np.any(mask) else 0
                 else:
                     segment_data = sweep.data
                     segment_time = sweep.time
@@ -2709,14 +2761,11 @@ class ABFViewerMainWindow(QMainWindow):
                 # Note: The peaks are already marked with correct time values,
                 # but we need to adjust the indices if we used a segment
                 if use_cursors and len(peaks) > 0:
-                    # Find indices in original data array based on time values
+                    # The segment is contiguous, so segment indices are offset by start_idx
                     adjusted_peaks = []
                     for peak in peaks:
-                        # Find closest index in original sweep data
-                        time_diff = np.abs(sweep.time - peak.time)
-                        original_idx = int(np.argmin(time_diff))
                         adjusted_peaks.append(Peak(
-                            index=original_idx,
+                            index=peak.index + int(start_idx),
                             time=peak.time,
                             value=peak.value,
                             is_max=peak.is_max
@@ -2728,16 +2777,7 @@ class ABFViewerMainWindow(QMainWindow):
                 # Mark peaks on plot
                 self.plot_widget.plot0.mark_peaks(self.peaks)
                 
-                # Add peaks to table
-                if self.peaks_table is None:
-                    self.peaks_table = PeaksTableDialog(self)
-                
-                # Ensure window is visible and brought to front
-                self.peaks_table.show()
-                self.peaks_table.raise_()
-                self.peaks_table.activateWindow()
-                if self.peaks_table.isMinimized():
-                    self.peaks_table.showNormal()
+                self._show_table('peaks_table', PeaksTableDialog)
                 
                 # Add peaks to table with current sweep number
                 self.peaks_table.add_peaks(self.peaks, self.abf_handler.current_sweep + 1)
@@ -2749,6 +2789,7 @@ class ABFViewerMainWindow(QMainWindow):
                     (" between cursors." if use_cursors else ".")
                 )
     
+    @Slot()
     def add_statistics(self):
         """Add statistics to table (Ctrl+T) - both channels, between cursors"""
         if not self.abf_handler.is_loaded:
@@ -2774,14 +2815,16 @@ class ABFViewerMainWindow(QMainWindow):
         time_ch1 = self.plot_widget.plot1.current_time if self.abf_handler.channel_count > 1 else None
         
         # Extract data between cursors for channel 0
-        mask_ch0 = (time_ch0 >= x1) & (time_ch0 <= x2)
-        segment_ch0 = data_ch0[mask_ch0] if data_ch0 is not None and time_ch0 is not None else None
+        segment_ch0 = None
+        if data_ch0 is not None and time_ch0 is not None:
+            start_idx, end_idx = self._slice_between(time_ch0, x1, x2)
+            segment_ch0 = data_ch0[start_idx:end_idx]
         
         # Extract data between cursors for channel 1
         segment_ch1 = None
         if data_ch1 is not None and time_ch1 is not None:
-            mask_ch1 = (time_ch1 >= x1) & (time_ch1 <= x2)
-            segment_ch1 = data_ch1[mask_ch1]
+            start_idx, end_idx = self._slice_between(time_ch1, x1, x2)
+            segment_ch1 = data_ch1[start_idx:end_idx]
         
         if segment_ch0 is None or len(segment_ch0) == 0:
             QMessageBox.warning(self, "Warning", "No data found between cursors.")
@@ -2791,62 +2834,27 @@ class ABFViewerMainWindow(QMainWindow):
         stats_ch0 = AnalysisTools.calculate_statistics(segment_ch0)
         stats_ch1 = AnalysisTools.calculate_statistics(segment_ch1) if segment_ch1 is not None and len(segment_ch1) > 0 else None
         
-        # Get or create statistics table
-        if self.statistics_table is None:
-            self.statistics_table = StatisticsTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.statistics_table.show()
-        self.statistics_table.raise_()
-        self.statistics_table.activateWindow()
-        if self.statistics_table.isMinimized():
-            self.statistics_table.showNormal()
+        self._show_table('statistics_table', StatisticsTableDialog)
         
         # Add statistics to table (both channels)
         self.statistics_table.add_statistics(stats_ch0, stats_ch1, self.abf_handler.current_sweep + 1)
     
+    @Slot()
     def show_statistics_table(self):
         """Show statistics table dialog"""
-        if self.statistics_table is None:
-            self.statistics_table = StatisticsTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.statistics_table.show()
-        self.statistics_table.raise_()
-        self.statistics_table.activateWindow()
-        
-        # If window was minimized, restore it
-        if self.statistics_table.isMinimized():
-            self.statistics_table.showNormal()
+        self._show_table('statistics_table', StatisticsTableDialog)
     
+    @Slot()
     def show_peaks_table(self):
         """Show peaks table dialog"""
-        if self.peaks_table is None:
-            self.peaks_table = PeaksTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.peaks_table.show()
-        self.peaks_table.raise_()
-        self.peaks_table.activateWindow()
-        
-        # If window was minimized, restore it
-        if self.peaks_table.isMinimized():
-            self.peaks_table.showNormal()
+        self._show_table('peaks_table', PeaksTableDialog)
     
+    @Slot()
     def show_blocks_table(self):
         """Show blocks table dialog"""
-        if self.blocks_table is None:
-            self.blocks_table = BlocksTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.blocks_table.show()
-        self.blocks_table.raise_()
-        self.blocks_table.activateWindow()
-        
-        # If window was minimized, restore it
-        if self.blocks_table.isMinimized():
-            self.blocks_table.showNormal()
+        self._show_table('blocks_table', BlocksTableDialog)
     
+    @Slot()
     def detect_blocks(self):
         """Detect block events in channel 0 - between cursors if enabled"""
         if not self.abf_handler.is_loaded:
@@ -2874,76 +2882,101 @@ class ABFViewerMainWindow(QMainWindow):
         if dialog.exec() != QDialog.Accepted:
             return
         
-        baseline_threshold = dialog.get_baseline_threshold()
-        block_threshold_factor = dialog.get_block_threshold_factor()
-        min_duration = dialog.get_min_duration()
-        
-        # Get all sweeps for channel 0
-        sweeps = self.abf_handler.get_all_sweeps(0)  # Use channel 0
-        
-        # Extract data segments between cursors for each sweep
-        segment_sweeps = []
-        for sweep in sweeps:
-            mask = (sweep.time >= x1) & (sweep.time <= x2)
-            if np.any(mask):
-                segment_data = sweep.data[mask]
-                segment_time = sweep.time[mask]
-                segment_command = sweep.command[mask] if sweep.command is not None else None
-                
-                # Create a new SweepData object with just the segment
-                segment_sweep = SweepData(
-                    sweep_number=sweep.sweep_number,
-                    channel=sweep.channel,
-                    time=segment_time,
-                    data=segment_data,
-                    command=segment_command,
-                    sample_rate=sweep.sample_rate
-                )
-                segment_sweeps.append(segment_sweep)
+        params = dialog.get_params()
+        
+        # Data segments between cursors, one row per sweep of channel 0
+        segments = self._segment_matrix(0, x1, x2)
         
-        if len(segment_sweeps) == 0:
+        if segments is None:
             QMessageBox.warning(self, "Warning", "No data found between cursors in any sweep.")
             return
-        
-        # Detect blocks across all sweeps
-        all_blocks = BlockDetector.detect_blocks_multiple_sweeps(
-            segment_sweeps,
-            baseline_threshold=baseline_threshold,
-            block_threshold_factor=block_threshold_factor,
-            min_block_duration=min_duration
+        segment_time, segment_data, _ = segments
+        
+        # Detect blocks across all sweeps off the GUI thread. The segments are views
+        # of the handler's cached sweep matrix; that is safe to share because the
+        # matrix is read-only and loading a file replaces the cache rather than
+        # writing into it, and the worker never touches the pyABF reader itself
+        self._block_job += 1
+        job = self._block_job
+        
+        progress = QProgressDialog("Detecting blocks...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Block Detection")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(self._cancel_block_detection)
+        self._block_progress = progress
+        
+        future = self._analysis_executor.submit(
+            BlockDetector.detect_blocks_matrix,
+            segment_data,
+            segment_time,
+            channel=0,
+            baseline_threshold=params.baseline_threshold,
+            block_threshold_factor=params.block_threshold_factor,
+            min_block_duration=params.min_block_duration
         )
+        future.add_done_callback(partial(self._post_block_result, job))
+    
+    def _post_block_result(self, job: int, future: Future):
+        """Hand a finished detection to the GUI thread (runs on the worker thread)"""
+        try:
+            self.blocks_detected.emit(job, future)
+        except RuntimeError:
+            pass  # Window already destroyed
+    
+    @Slot()
+    def _cancel_block_detection(self):
+        """Drop the running detection's result (the scan itself runs to completion)"""
+        self._block_job += 1
+        self._close_block_progress()
+        self.status_label.setText("Block detection cancelled")
+    
+    def _close_block_progress(self):
+        """Close the block detection progress dialog, if one is open"""
+        if self._block_progress is not None:
+            with QSignalBlocker(self._block_progress):
+                self._block_progress.close()
+            self._block_progress.deleteLater()
+            self._block_progress = None
+    
+    @Slot(int, object)
+    def _on_blocks_detected(self, job: int, future: Future):
+        """Show the results of a background block detection"""
+        if job != self._block_job:
+            return
+        self._close_block_progress()
+        
+        try:
+            block_events = future.result()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Block detection failed:\n{e}")
+            return
+        all_blocks = block_events.as_records()
         
-        # Store detected blocks for marker updates when changing sweeps
-        self.detected_blocks = all_blocks
+        # Store detected blocks by sweep for marker updates when changing sweeps
+        self.detected_blocks = {}
+        for block in all_blocks:
+            self.detected_blocks.setdefault(block['sweep_number'], []).append(block)
         
         if len(all_blocks) == 0:
             QMessageBox.information(self, "Block Detection", "No blocks detected with current parameters.")
             return
         
-        # Get or create blocks table
-        if not hasattr(self, 'blocks_table') or self.blocks_table is None:
-            self.blocks_table = BlocksTableDialog(self)
-        
-        # Ensure window is visible and brought to front
-        self.blocks_table.show()
-        self.blocks_table.raise_()
-        self.blocks_table.activateWindow()
-        if self.blocks_table.isMinimized():
-            self.blocks_table.showNormal()
+        self._show_table('blocks_table', BlocksTableDialog)
         
         # Add blocks to table
-        self.blocks_table.add_blocks(all_blocks)
+        self.blocks_table.add_blocks(block_events)
         
         # Mark blocks on plot (only show blocks from current sweep)
-        current_sweep_num = self.abf_handler.current_sweep
-        current_sweep_blocks = [b for b in all_blocks if b.get('sweep_number') == current_sweep_num]
+        current_sweep_blocks = self.detected_blocks.get(self.abf_handler.current_sweep)
         if current_sweep_blocks:
             self.plot_widget.plot0.mark_blocks(current_sweep_blocks)
         
         # Show summary message
-        total_blocks = len(all_blocks)
-        unique_sweeps = len(set(block.get('sweep_number', 0) for block in all_blocks))
-        avg_amplitude = np.mean([block.get('average_amplitude', 0) for block in all_blocks])
+        total_blocks = len(block_events)
+        unique_sweeps = len(np.unique(block_events.sweep_number))
+        amplitudes = block_events.average_amplitude
+        avg_amplitude = amplitudes.mean() if amplitudes.size else 0.0
         
         QMessageBox.information(
             self, "Block Detection",
@@ -2953,10 +2986,29 @@ class ABFViewerMainWindow(QMainWindow):
             f"Block regions highlighted on current sweep plot."
         )
     
+    def _segment_matrix(self, channel: int, x1: float, x2: float
+                        ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        All sweeps of a channel cut to x1 <= time <= x2, as (time, data, command)
+        with one row per sweep in data and command (None if no samples fall inside)
+        """
+        matrix = self.abf_handler.get_sweep_matrix(channel)
+        if matrix is None:
+            return None
+        
+        # Sweeps share one time base, so the bounds are found once and the
+        # segments are column slices of the sweep matrices
+        time, data, command = matrix
+        start_idx, end_idx = self._slice_between(time, x1, x2)
+        if end_idx <= start_idx:
+            return None
+        return time[start_idx:end_idx], data[:, start_idx:end_idx], command[:, start_idx:end_idx]
+    
+    @Slot()
     def clear_analysis(self):
         """Clear all analysis markers (peaks and blocks) from the plot"""
         self.peaks = []
-        self.detected_blocks = []
+        self.detected_blocks = {}
         self.plot_widget.plot0.clear_peak_markers()
         self.plot_widget.plot1.clear_peak_markers()
         self.plot_widget.plot0.clear_block_markers()
@@ -2972,11 +3024,12 @@ class ABFViewerMainWindow(QMainWindow):
     
     def clear_blocks(self):
         """Clear block markers from the plot"""
-        self.detected_blocks = []
+        self.detected_blocks = {}
         self.plot_widget.plot0.clear_block_markers()
         self.plot_widget.plot1.clear_block_markers()
         QMessageBox.information(self, "Clear Blocks", "Block markers cleared from plot.")
     
+    @Slot()
     def detect_inserts(self):
         """Detect inserts/responses in channel 0 - between cursors if enabled"""
         if not self.abf_handler.is_loaded:
@@ -2996,37 +3049,18 @@ class ABFViewerMainWindow(QMainWindow):
         if x1 > x2:
             x1, x2 = x2, x1
         
-        # Get all sweeps for channel 0
-        sweeps = self.abf_handler.get_all_sweeps(0)  # Use channel 0
-        
-        # Extract data segments between cursors for each sweep
-        segment_sweeps = []
-        for sweep in sweeps:
-            mask = (sweep.time >= x1) & (sweep.time <= x2)
-            if np.any(mask):
-                segment_data = sweep.data[mask]
-                segment_time = sweep.time[mask]
-                segment_command = sweep.command[mask] if sweep.command is not None else None
-                
-                # Create a new SweepData object with just the segment
-                segment_sweep = SweepData(
-                    sweep_number=sweep.sweep_number,
-                    channel=sweep.channel,
-                    time=segment_time,
-                    data=segment_data,
-                    command=segment_command,
-                    sample_rate=sweep.sample_rate
-                )
-                segment_sweeps.append(segment_sweep)
+        # Data segments between cursors for each sweep of channel 0
+        segments = self._segment_matrix(0, x1, x2)
         
-        if len(segment_sweeps) == 0:
+        if segments is None:
             QMessageBox.warning(self, "Warning", "No data found between cursors in any sweep.")
             return
         
         # For insert detection, the method uses fractional time windows (0.0-0.1 for baseline, etc.)
         # Since we're working with segments, we'll pass the segments and let the method work
         # with them as if they were full sweeps (the time will be relative to the segment)
-        inserts = BlockDetector.detect_inserts(segment_sweeps)
+        _, segment_data, _ = segments
+        inserts = BlockDetector.detect_inserts_matrix(segment_data)
         
         msg = f"Detected {len(inserts)} insert(s)/response(s) in Channel 0 (between cursors):\n\n"
         for i, insert in enumerate(inserts[:20]):  # Limit to first 20
@@ -3039,6 +3073,7 @@ class ABFViewerMainWindow(QMainWindow):
         
         QMessageBox.information(self, "Insert Detection", msg)
     
+    @Slot()
     def export_data(self):
         """Export current sweep data (both channels if available)"""
         if not self.abf_handler.is_loaded:
@@ -3052,42 +3087,33 @@ class ABFViewerMainWindow(QMainWindow):
         if file_path:
             try:
                 # Get both channels
-                channel0_sweep = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 0)
+                channel0_sweep = self._get_sweep(self.abf_handler.current_sweep, 0)
                 channel1_sweep = None
                 if self.abf_handler.channel_count > 1:
-                    channel1_sweep = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 1)
+                    channel1_sweep = self._get_sweep(self.abf_handler.current_sweep, 1)
                 
                 if channel0_sweep:
+                    columns = [('Time', channel0_sweep.time), ('Channel0', channel0_sweep.data)]
                     if channel1_sweep:
-                        # Export both channels
-                        data = np.column_stack([
-                            channel0_sweep.time, 
-                            channel0_sweep.data, 
-                            channel1_sweep.data
-                        ])
-                        if channel0_sweep.command is not None and len(channel0_sweep.command) > 0:
-                            data = np.column_stack([data, channel0_sweep.command])
-                            np.savetxt(file_path, data, delimiter=',', 
-                                     header='Time,Channel0,Channel1,Command', comments='')
-                        else:
-                            np.savetxt(file_path, data, delimiter=',', 
-                                     header='Time,Channel0,Channel1', comments='')
-                    else:
-                        # Export only channel 0
-                        data = np.column_stack([channel0_sweep.time, channel0_sweep.data])
-                        if channel0_sweep.command is not None and len(channel0_sweep.command) > 0:
-                            data = np.column_stack([data, channel0_sweep.command])
-                            np.savetxt(file_path, data, delimiter=',', 
-                                     header='Time,Channel0,Command', comments='')
-                        else:
-                            np.savetxt(file_path, data, delimiter=',', 
-                                     header='Time,Channel0', comments='')
+                        columns.append(('Channel1', channel1_sweep.data))
+                    if channel0_sweep.command.size:
+                        columns.append(('Command', channel0_sweep.command))
+                    
+                    # Fill one preallocated table rather than stacking columns repeatedly
+                    arrays = [column for _, column in columns]
+                    data = np.empty((len(channel0_sweep.time), len(arrays)), dtype=np.result_type(*arrays))
+                    for i, column in enumerate(arrays):
+                        data[:, i] = column
+                    # Time to the microsecond; 6 significant digits is beyond the ADC resolution
+                    fmt = ['%.6f'] + ['%.6g'] * (len(columns) - 1)
+                    write_csv(file_path, data, ','.join(name for name, _ in columns), fmt=fmt)
                     QMessageBox.information(self, "Export", "Data exported successfully.")
                 else:
                     QMessageBox.warning(self, "Warning", "No data to export.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export data: {e}")
     
+    @Slot()
     def save_as_abf(self):
         """Save current trace as ABF file (with filters applied if any)"""
         if not self.abf_handler.is_loaded:
@@ -3129,63 +3155,55 @@ class ABFViewerMainWindow(QMainWindow):
         try:
             # Get current data (filtered if filters were applied)
             # Channel 0
-            channel0_sweep_orig = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 0)
+            channel0_sweep_orig = self._get_sweep(self.abf_handler.current_sweep, 0)
             if not channel0_sweep_orig:
                 QMessageBox.warning(self, "Warning", "No data available to save.")
                 return
             
             # Use filtered data if available, otherwise use original
+            # (writeABF1 only reads the data, so no copies are made)
             if self.filtered_data_ch0 is not None and self.filtered_time_ch0 is not None:
-                ch0_data = self.filtered_data_ch0.copy()
-                ch0_time = self.filtered_time_ch0.copy()
+                ch0_data = self.filtered_data_ch0
+                ch0_time = self.filtered_time_ch0
             else:
-                ch0_data = channel0_sweep_orig.data.copy()
-                ch0_time = channel0_sweep_orig.time.copy()
+                ch0_data = channel0_sweep_orig.data
+                ch0_time = channel0_sweep_orig.time
             
-            # Get cursor range if saving between cursors
-            cursor_x1 = None
-            cursor_x2 = None
+            # Get sample range (whole sweep unless saving between cursors)
+            start_idx, end_idx = 0, len(ch0_data)
             if save_between_cursors:
                 x1, y1, x2, y2 = self.plot_widget.plot0.get_cursor_positions()
                 cursor_x1, cursor_x2 = (x1, x2) if x1 <= x2 else (x2, x1)
                 
                 # Extract region between cursors
-                mask = (ch0_time >= cursor_x1) & (ch0_time <= cursor_x2)
-                if not np.any(mask):
+                start_idx, end_idx = self._slice_between(ch0_time, cursor_x1, cursor_x2)
+                if end_idx <= start_idx:
                     QMessageBox.warning(self, "Warning", "No data found between cursors.")
                     return
                 
-                ch0_data = ch0_data[mask]
-                ch0_time = ch0_time[mask]
+                ch0_data = ch0_data[start_idx:end_idx]
             
             # Channel 1 if available
             channel1_data = None
             if self.abf_handler.channel_count > 1:
-                channel1_sweep_orig = self.abf_handler.get_sweep(self.abf_handler.current_sweep, 1)
+                channel1_sweep_orig = self._get_sweep(self.abf_handler.current_sweep, 1)
                 if channel1_sweep_orig:
                     # Use filtered data if available
                     if self.filtered_data_ch1 is not None and self.filtered_time_ch1 is not None:
-                        ch1_data = self.filtered_data_ch1.copy()
-                        ch1_time = self.filtered_time_ch1.copy()
+                        ch1_data = self.filtered_data_ch1
                     else:
-                        ch1_data = channel1_sweep_orig.data.copy()
-                        ch1_time = channel1_sweep_orig.time.copy()
+                        ch1_data = channel1_sweep_orig.data
                     
-                    # Extract region if saving between cursors
-                    if save_between_cursors and cursor_x1 is not None and cursor_x2 is not None:
-                        mask = (ch1_time >= cursor_x1) & (ch1_time <= cursor_x2)
-                        if np.any(mask):
-                            channel1_data = ch1_data[mask]
-                    else:
-                        # Ensure same length as ch0
-                        if len(ch1_data) == len(ch0_data):
-                            channel1_data = ch1_data
-                        elif len(ch1_data) > len(ch0_data):
-                            channel1_data = ch1_data[:len(ch0_data)]
-                        else:
-                            # Pad with last value
-                            channel1_data = np.pad(ch1_data, (0, len(ch0_data) - len(ch1_data)), 
-                                                  mode='edge')
+                    # Both channels come from the same sweep (filtered buffers always
+                    # span the whole sweep), so they share a time base and one slice fits both
+                    channel1_data = ch1_data[start_idx:end_idx]
+                    if len(channel1_data) != len(ch0_data):
+                        QMessageBox.warning(
+                            self, "Warning",
+                            f"Channel 1 has {len(channel1_data)} samples but channel 0 has "
+                            f"{len(ch0_data)}. Switch sweeps to discard the filters and try saving again."
+                        )
+                        return
             
             # Prepare data for writing
             # writeABF1 expects data in shape (sweeps, points) - 2D array where each row is a sweep
@@ -3202,21 +3220,16 @@ class ABFViewerMainWindow(QMainWindow):
                 # Or we could save channel 0 and prompt for channel 1 separately
                 # For now, let's save channel 0 in the main file and channel 1 separately
                 
-                # Ensure both channels have the same length
-                min_len = min(len(ch0_data), len(channel1_data))
-                ch0_data = ch0_data[:min_len]
-                channel1_data = channel1_data[:min_len]
-                
                 # Save channel 0
-                # Reshape to (1 sweep, N points)
-                data_array_ch0 = ch0_data.reshape(1, -1)
+                # Reshape to (1 sweep, N points); contiguous float32 data is passed without a copy
+                data_array_ch0 = np.ascontiguousarray(ch0_data, dtype=np.float32).reshape(1, -1)
                 writeABF1(data_array_ch0, file_path, sample_rate, units=ch0_units)
                 
                 # Save channel 1 to a separate file
                 base_path = file_path.rsplit('.', 1)[0]
                 ch1_file_path = f"{base_path}_ch1.abf"
                 ch1_units = info.adc_units[1] if len(info.adc_units) > 1 else 'mV'
-                data_array_ch1 = channel1_data.reshape(1, -1)
+                data_array_ch1 = np.ascontiguousarray(channel1_data, dtype=np.float32).reshape(1, -1)
                 writeABF1(data_array_ch1, ch1_file_path, sample_rate, units=ch1_units)
                 
                 QMessageBox.information(self, "Save", 
@@ -3226,8 +3239,8 @@ class ABFViewerMainWindow(QMainWindow):
                 return
             else:
                 # Single channel
-                # Reshape to (1 sweep, N points)
-                data_array = ch0_data.reshape(1, -1)
+                # Reshape to (1 sweep, N points); contiguous float32 data is passed without a copy
+                data_array = np.ascontiguousarray(ch0_data, dtype=np.float32).reshape(1, -1)
                 
                 # Write ABF file with correct parameter order: (data, filename, sampleRate, units)
                 writeABF1(data_array, file_path, sample_rate, units=ch0_units)